@@ -5,168 +5,98 @@ Beautiful, professional email reports with enhanced formatting
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union, TypedDict, Tuple, Callable, TYPE_CHECKING
+from types import MappingProxyType
 from datetime import datetime
-import json
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.image import MIMEImage
-import os
+import orjson
+import sys
+import string
+import re
+import html
+import io
+from hashing import content_hash
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+# SMTP and MIME modules are only needed when actually sending; they are
+# imported inside send_daily_report / _get_smtp so rendering stays light.
+if TYPE_CHECKING:
+    import aiosmtplib
 
 logger = logging.getLogger(__name__)
 
+# Most SMTP servers cap how many messages one session may deliver
+MAX_MESSAGES_PER_CONNECTION = 100
 
-class EnhancedEmailReporter:
-    """
-    Creates and sends beautiful, professional AI update emails
-    """
-    
-    def __init__(self, email_config: Dict[str, str]):
-        """
-        Initialize email reporter
-        
-        Args:
-            email_config: Dict with smtp_server, smtp_port, username, password, from_email, to_email
-        """
-        self.config = email_config
-        logger.info("✓ Enhanced email reporter initialized")
-    
-    async def send_daily_report(
-        self,
-        analysis: Dict[str, Any],
-        all_data: Dict[str, List],
-        stats: Dict[str, Any]
-    ) -> bool:
-        """
-        Send comprehensive daily AI update email
-        """
-        logger.info("="*70)
-        logger.info("Generating and sending daily AI update email")
-        logger.info("="*70)
-        
-        try:
-            # Create email
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = self._create_subject_line(analysis)
-            msg['From'] = self.config['from_email']
-            msg['To'] = self.config['to_email']
-            msg['Date'] = datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
-            
-            # Create both HTML and plain text versions
-            html_body = self._create_html_email(analysis, all_data, stats)
-            text_body = self._create_text_email(analysis, all_data, stats)
-            
-            # Attach both versions
-            part1 = MIMEText(text_body, 'plain', 'utf-8')
-            part2 = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(part1)
-            msg.attach(part2)
-            
-            # Send email
-            logger.info("Sending email...")
-            with smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port']) as server:
-                server.starttls()
-                server.login(self.config['username'], self.config['password'])
-                server.send_message(msg)
-            
-            logger.info(f"✓ Email sent successfully to {self.config['to_email']}")
-            logger.info("="*70)
-            return True
-            
-        except Exception as e:
-            logger.error(f"✗ Email sending failed: {e}")
-            logger.info("="*70)
-            return False
-    
-    def _create_subject_line(self, analysis: Dict) -> str:
-        """Create engaging subject line"""
-        date_str = datetime.now().strftime('%B %d, %Y')
-        
-        # Try to extract key topic from summary
-        summary = analysis.get('executive_summary', '')
-        
-        # Simple but engaging subject
-        return f"🤖 Daily AI Update - {date_str} | Latest Breakthroughs & Trends"
-    
-    def _create_html_email(
-        self,
-        analysis: Dict,
-        all_data: Dict,
-        stats: Dict
-    ) -> str:
-        """Create beautiful HTML email"""
-        
-        # Header section
-        header = self._create_email_header(stats)
-        
-        # Executive summary section
-        exec_summary = self._create_executive_summary_section(analysis)
-        
-        # Key developments section
-        key_devs = self._create_key_developments_section(analysis)
-        
-        # Trends section
-        trends = self._create_trends_section(analysis)
-        
-        # Breakthrough technologies section
-        breakthroughs = self._create_breakthroughs_section(analysis)
-        
-        # Industry impact section
-        industry = self._create_industry_impact_section(analysis)
-        
-        # Actionable insights section
-        insights = self._create_actionable_insights_section(analysis)
-        
-        # Future predictions section
-        future = self._create_future_predictions_section(analysis)
-        
-        # Source articles section
-        sources = self._create_sources_section(all_data, analysis)
-        
-        # Footer
-        footer = self._create_email_footer()
-        
-        # Complete HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Daily AI Update</title>
-    <style>
-        body {{
+# Number of rendered HTML reports (and their delivered-recipient sets) kept for retries
+HTML_CACHE_SIZE = 4
+
+# Shared read-only defaults for missing analysis fields
+_EMPTY_LIST: tuple = ()
+_EMPTY_DICT = MappingProxyType({})
+
+
+class AnalysisDict(TypedDict, total=False):
+    """Shape of GeminiProcessor.process_all_data output"""
+    timestamp: str
+    executive_summary: str
+    key_developments: List[Dict[str, Any]]
+    trends_and_patterns: Dict[str, Any]
+    breakthrough_technologies: List[Dict[str, Any]]
+    industry_impact: Dict[str, Any]
+    actionable_insights: Dict[str, List[str]]
+    future_predictions: Dict[str, Any]
+    prioritization: Dict[str, List[Dict[str, Any]]]
+    metadata: Dict[str, Any]
+
+
+class StatsDict(TypedDict, total=False):
+    """Shape of AIDataRetriever.get_summary_stats output"""
+    total_items: int
+    sources_count: int
+    sources_list: List[str]
+    by_category: Dict[str, int]
+    by_source: Dict[str, int]
+    research_count: int
+    models_count: int
+    tools_count: int
+
+# Static stylesheet shared by every report
+EMAIL_CSS_RAW = """
+        body {
             margin: 0;
             padding: 0;
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background-color: #f5f7fa;
             color: #2d3748;
             line-height: 1.6;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 700px;
             margin: 0 auto;
             background-color: #ffffff;
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px 30px;
             text-align: center;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0;
             font-size: 32px;
             font-weight: 700;
             text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .header .subtitle {{
+        }
+        .header .subtitle {
             margin: 10px 0 0 0;
             font-size: 16px;
             opacity: 0.95;
-        }}
-        .stats-bar {{
+        }
+        .stats-bar {
             background: rgba(255,255,255,0.15);
             padding: 20px;
             margin-top: 20px;
@@ -174,58 +104,58 @@ class EnhancedEmailReporter:
             display: flex;
             justify-content: space-around;
             flex-wrap: wrap;
-        }}
-        .stat-item {{
+        }
+        .stat-item {
             text-align: center;
             padding: 10px;
-        }}
-        .stat-number {{
+        }
+        .stat-number {
             font-size: 28px;
             font-weight: 700;
             display: block;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 12px;
             text-transform: uppercase;
             opacity: 0.9;
             letter-spacing: 0.5px;
-        }}
-        .content {{
+        }
+        .content {
             padding: 30px;
-        }}
-        .section {{
+        }
+        .section {
             margin-bottom: 40px;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-size: 24px;
             font-weight: 700;
             color: #1a202c;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 3px solid #667eea;
-        }}
-        .section-title .emoji {{
+        }
+        .section-title .emoji {
             margin-right: 10px;
-        }}
-        .card {{
+        }
+        .card {
             background: #f7fafc;
             border-left: 4px solid #667eea;
             padding: 20px;
             margin-bottom: 15px;
             border-radius: 4px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .card-title {{
+        }
+        .card-title {
             font-size: 18px;
             font-weight: 600;
             color: #2d3748;
             margin-bottom: 10px;
-        }}
-        .card-content {{
+        }
+        .card-content {
             color: #4a5568;
             margin-bottom: 10px;
-        }}
-        .badge {{
+        }
+        .badge {
             display: inline-block;
             padding: 4px 12px;
             border-radius: 12px;
@@ -235,25 +165,25 @@ class EnhancedEmailReporter:
             letter-spacing: 0.5px;
             margin-right: 8px;
             margin-bottom: 8px;
-        }}
-        .badge-critical {{ background: #fee; color: #c53030; }}
-        .badge-high {{ background: #fef5e7; color: #d97706; }}
-        .badge-medium {{ background: #e6f7ff; color: #2563eb; }}
-        .badge-low {{ background: #f0f0f0; color: #64748b; }}
-        .badge-research {{ background: #f0fdf4; color: #059669; }}
-        .badge-tool {{ background: #fef3c7; color: #d97706; }}
-        .numbered-list {{
+        }
+        .badge-critical { background: #fee; color: #c53030; }
+        .badge-high { background: #fef5e7; color: #d97706; }
+        .badge-medium { background: #e6f7ff; color: #2563eb; }
+        .badge-low { background: #f0f0f0; color: #64748b; }
+        .badge-research { background: #f0fdf4; color: #059669; }
+        .badge-tool { background: #fef3c7; color: #d97706; }
+        .numbered-list {
             counter-reset: item;
             list-style: none;
             padding-left: 0;
-        }}
-        .numbered-list li {{
+        }
+        .numbered-list li {
             counter-increment: item;
             margin-bottom: 20px;
             padding-left: 40px;
             position: relative;
-        }}
-        .numbered-list li::before {{
+        }
+        .numbered-list li::before {
             content: counter(item);
             position: absolute;
             left: 0;
@@ -267,20 +197,20 @@ class EnhancedEmailReporter:
             align-items: center;
             justify-content: center;
             font-weight: 700;
-        }}
-        .trend-item {{
+        }
+        .trend-item {
             padding: 15px;
             background: white;
             border-radius: 8px;
             margin-bottom: 15px;
             border: 1px solid #e2e8f0;
-        }}
-        .trend-title {{
+        }
+        .trend-title {
             font-weight: 600;
             color: #2d3748;
             margin-bottom: 8px;
-        }}
-        .trend-strength {{
+        }
+        .trend-strength {
             display: inline-block;
             padding: 2px 8px;
             background: #10b981;
@@ -289,147 +219,280 @@ class EnhancedEmailReporter:
             font-size: 11px;
             font-weight: 600;
             text-transform: uppercase;
-        }}
-        .insights-grid {{
+        }
+        .insights-grid {
             display: grid;
             grid-template-columns: 1fr;
             gap: 15px;
-        }}
-        .insight-box {{
+        }
+        .insight-box {
             background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%);
             padding: 20px;
             border-radius: 8px;
             border-left: 4px solid #667eea;
-        }}
-        .insight-title {{
+        }
+        .insight-title {
             font-weight: 700;
             color: #667eea;
             margin-bottom: 10px;
             font-size: 16px;
-        }}
-        .insight-list {{
+        }
+        .insight-list {
             list-style: none;
             padding-left: 0;
-        }}
-        .insight-list li {{
+        }
+        .insight-list li {
             padding-left: 20px;
             margin-bottom: 8px;
             position: relative;
-        }}
-        .insight-list li::before {{
+        }
+        .insight-list li::before {
             content: "→";
             position: absolute;
             left: 0;
             color: #667eea;
             font-weight: 700;
-        }}
-        .source-grid {{
+        }
+        .source-grid {
             display: grid;
             grid-template-columns: 1fr;
             gap: 15px;
-        }}
-        .source-card {{
+        }
+        .source-card {
             background: white;
             border: 1px solid #e2e8f0;
             padding: 20px;
             border-radius: 8px;
             transition: box-shadow 0.3s;
-        }}
-        .source-card:hover {{
+        }
+        .source-card:hover {
             box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }}
-        .source-title {{
+        }
+        .source-title {
             font-size: 16px;
             font-weight: 600;
             color: #2d3748;
             margin-bottom: 10px;
-        }}
-        .source-meta {{
+        }
+        .source-meta {
             font-size: 13px;
             color: #718096;
             margin-bottom: 10px;
-        }}
-        .source-link {{
+        }
+        .source-link {
             display: inline-block;
             margin-top: 10px;
             color: #667eea;
             text-decoration: none;
             font-weight: 600;
             font-size: 14px;
-        }}
-        .source-link:hover {{
+        }
+        .source-link:hover {
             text-decoration: underline;
-        }}
-        .footer {{
+        }
+        .footer {
             background: #2d3748;
             color: #cbd5e0;
             padding: 30px;
             text-align: center;
             font-size: 14px;
-        }}
-        .footer-links {{
+        }
+        .footer-links {
             margin-top: 15px;
-        }}
-        .footer-link {{
+        }
+        .footer-link {
             color: #90cdf4;
             text-decoration: none;
             margin: 0 10px;
-        }}
-        @media only screen and (max-width: 600px) {{
-            .header {{
+        }
+        @media only screen and (max-width: 600px) {
+            .header {
                 padding: 30px 20px;
-            }}
-            .header h1 {{
+            }
+            .header h1 {
                 font-size: 24px;
-            }}
-            .content {{
+            }
+            .content {
                 padding: 20px;
-            }}
-            .section-title {{
+            }
+            .section-title {
                 font-size: 20px;
-            }}
-            .stats-bar {{
+            }
+            .stats-bar {
                 flex-direction: column;
-            }}
-        }}
-    </style>
+            }
+        }
+"""
+
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and collapse whitespace in a stylesheet"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,])\s*', r'\1', css)
+    return css.strip()
+
+
+# Minified once at import; inlined in every report
+_EMAIL_CSS_MIN = _minify_css(EMAIL_CSS_RAW)
+
+# Outer document scaffold written around the report body
+_SHELL_OPEN = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Daily AI Update</title>
+    <style>""" + _EMAIL_CSS_MIN + """</style>
 </head>
 <body>
     <div class="container">
-        {header}
-        <div class="content">
-            {exec_summary}
-            {key_devs}
-            {trends}
-            {breakthroughs}
-            {industry}
-            {insights}
-            {future}
-            {sources}
-        </div>
-        {footer}
+"""
+
+_SHELL_CLOSE = """
     </div>
 </body>
 </html>
 """
-        
-        return html
+
+_CONTENT_OPEN = '\n        <div class="content">\n'
+_CONTENT_CLOSE = '\n        </div>\n'
+
+# Badge classes for key developments
+_IMPORTANCE_BADGE = {
+    'Critical': 'badge-critical',
+    'High': 'badge-high',
+    'Medium': 'badge-medium'
+}
+
+_CATEGORY_BADGE = {
+    'Model Release': 'badge-high',
+    'Research': 'badge-research',
+    'Tool': 'badge-tool',
+    'News': 'badge-medium'
+}
+
+# Emoji per actionable-insights audience
+_INSIGHT_EMOJIS = {
+    'ai_practitioners': '👨‍💻',
+    'business_leaders': '💼',
+    'researchers': '🔬',
+    'investors': '💰',
+    'general_public': '👥'
+}
+
+# Opening/closing markup shared by every content section
+_SECTION_OPEN = string.Template("""
+        <div class="section">
+            <h2 class="section-title"><span class="emoji">$emoji</span>$title</h2>
+""")
+
+_SECTION_CLOSE = """
+        </div>
+        """
+
+# Headers of the fixed-title sections, substituted once at import
+_SECTION_HEADERS = MappingProxyType({
+    key: _SECTION_OPEN.substitute(emoji=emoji, title=title)
+    for key, emoji, title in (
+        ('executive_summary', "📊", "Executive Summary"),
+        ('key_developments', "🔥", "Top 10 Key Developments"),
+        ('trends', "📈", "Trends & Patterns"),
+        ('breakthroughs', "💡", "Breakthrough Technologies"),
+        ('industry_impact', "🏭", "Industry Impact"),
+        ('actionable_insights', "💡", "Actionable Insights"),
+        ('future_predictions', "🔮", "Future Outlook"),
+    )
+})
+
+_PREDICTION_TIMEFRAMES = ('next_week', 'next_month', 'next_quarter')
+
+# Plain text fallback; everything except the five placeholders is static
+_TEXT_RULE = '=' * 70
+_TEXT_EMAIL = string.Template(f"""
+{_TEXT_RULE}
+DAILY AI UPDATE - $date
+{_TEXT_RULE}
+
+STATISTICS
+----------
+Total Updates: $total_items
+Sources: $sources_count
+
+EXECUTIVE SUMMARY
+-----------------
+$summary
+
+{_TEXT_RULE}
+
+[View full report with formatting in HTML version]
+
+Generated by Daily AI Updates System
+Powered by Gemini AI
+$generated
+        """)
+
+
+def _gil_disabled() -> bool:
+    """True on free-threaded CPython builds running without the GIL"""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+# Render sections on worker threads only when they can actually run in
+# parallel; with the GIL the thread hand-off costs more than it saves.
+PARALLEL_SECTIONS = _gil_disabled()
+_section_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_section_executor() -> ThreadPoolExecutor:
+    """Lazily create the pool shared by all reporters"""
+    global _section_executor
+    if _section_executor is None:
+        _section_executor = ThreadPoolExecutor(thread_name_prefix="email-section")
+    return _section_executor
+
+
+def _render_section_part(writer: Tuple[Callable[..., None], tuple]) -> str:
+    """Run one _write_*_section into a private buffer and return its text"""
+    write, args = writer
+    part = io.StringIO()
+    write(part, *args)
+    return part.getvalue()
+
+
+def _escape_source_item(item: Dict[str, Any]) -> Dict[str, str]:
+    """
+    HTML-escape the fields shown on a source card
     
-    def _create_email_header(self, stats: Dict) -> str:
-        """Create email header with stats"""
-        date_str = datetime.now().strftime('%B %d, %Y')
-        time_str = datetime.now().strftime('%I:%M %p')
-        
-        total_items = stats.get('total_items', 0)
-        sources_count = stats.get('sources_count', 0)
-        
-        # Count by category
-        categories = stats.get('by_category', {})
-        research_count = categories.get('Research Paper', 0) + categories.get('Research with Code', 0)
-        models_count = categories.get('Model Release', 0)
-        tools_count = categories.get('Open Source Tool', 0) + categories.get('Tool Update', 0)
-        
-        return f"""
+    Titles, summaries and URLs come straight from scraped feeds, so they are
+    escaped before interpolation. The summary is truncated first so an entity
+    is never cut in half.
+    """
+    summary = (item.get('summary') or item.get('description') or 'No summary available')[:200]
+    return {
+        'title': html.escape(str(item.get('title', 'Unknown'))),
+        'source': html.escape(str(item.get('source', 'Unknown'))),
+        'category': html.escape(str(item.get('category', 'Unknown'))),
+        'url': html.escape(str(item.get('url', '#'))),
+        'summary': html.escape(str(summary)),
+    }
+
+
+@lru_cache(maxsize=128)
+def _render_header(
+    date_str: str,
+    time_str: str,
+    total_items: int,
+    sources_count: int,
+    research_count: int,
+    models_count: int,
+    tools_count: int
+) -> str:
+    """Render the stats header; memoized on the handful of values it shows"""
+    return f"""
         <div class="header">
             <h1>🤖 Daily AI Update</h1>
             <p class="subtitle">{date_str} • {time_str}</p>
@@ -457,45 +520,421 @@ class EnhancedEmailReporter:
             </div>
         </div>
         """
+
+
+def _render_footer(generated: str) -> str:
+    """
+    Render the footer; only the generation timestamp varies
     
-    def _create_executive_summary_section(self, analysis: Dict) -> str:
-        """Create executive summary section"""
-        summary = analysis.get('executive_summary', 'No summary available')
+    Not memoized: the timestamp has one-second resolution, so calls
+    practically never repeat an argument. The static markup around it is
+    part of the f-string's compiled constants either way.
+    """
+    return f"""
+        <div class="footer">
+            <p style="margin: 0 0 10px 0; font-size: 16px; font-weight: 600;">Daily AI Updates</p>
+            <p style="margin: 0 0 15px 0;">Powered by Gemini AI • Delivered with ❤️</p>
+            <p style="margin: 0; font-size: 12px; color: #a0aec0;">
+                Generated: {generated}
+            </p>
+            <div class="footer-links">
+                <a href="#" class="footer-link">Preferences</a>
+                <a href="#" class="footer-link">Unsubscribe</a>
+            </div>
+        </div>
+        """
+
+
+class EnhancedEmailReporter:
+    """
+    Creates and sends beautiful, professional AI update emails
+    """
+    
+    def __init__(self, email_config: Dict[str, str]):
+        """
+        Initialize email reporter
         
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">📊</span>Executive Summary</h2>
+        Args:
+            email_config: Dict with smtp_server, smtp_port, username, password, from_email, to_email
+                and optionally include_text_fallback (default True)
+        """
+        self.config = email_config
+        self._smtp: Optional['aiosmtplib.SMTP'] = None
+        self._messages_sent = 0  # on the current connection
+        self._html_cache: "OrderedDict[str, str]" = OrderedDict()
+        # Renders run in to_thread workers
+        self._html_cache_lock = threading.Lock()
+        # Recipients each report already reached, so a retry skips them
+        self._delivered: "OrderedDict[str, set]" = OrderedDict()
+        # Outcome of the latest send_daily_report: delivered / skipped / failed addresses
+        self.last_delivery: Dict[str, List[str]] = {'delivered': [], 'skipped': [], 'failed': []}
+        logger.info("✓ Enhanced email reporter initialized")
+    
+    async def send_daily_report(
+        self,
+        analysis: AnalysisDict,
+        all_data: Dict[str, List],
+        stats: StatsDict,
+        to_emails: Optional[Union[str, List[str]]] = None,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """
+        Send comprehensive daily AI update email
+        
+        Args:
+            analysis: Output of GeminiProcessor.process_all_data
+            all_data: Raw items per source
+            stats: Output of AIDataRetriever.get_summary_stats
+            to_emails: Recipient or list of recipients (default: config['to_email'])
+            now: Report timestamp (default: now); pass the same value when
+                retrying a send so the cached HTML render is reused and
+                recipients that already got this report are skipped
+        
+        Returns:
+            True once every recipient has the report. On a partial send,
+            last_delivery lists who got it and who didn't.
+        
+        Every recipient gets an individual copy over the same SMTP session.
+        A failed recipient doesn't stop the others.
+        """
+        logger.info("="*70)
+        logger.info("Generating and sending daily AI update email")
+        logger.info("="*70)
+        
+        from email.message import EmailMessage
+        from email.utils import format_datetime
+        
+        self.last_delivery = {'delivered': [], 'skipped': [], 'failed': []}
+        recipients: List[str] = []
+        try:
+            recipients = self._parse_recipients(
+                to_emails if to_emails is not None else self.config['to_email']
+            )
+            if not recipients:
+                raise ValueError("no recipients configured")
+            
+            # One timestamp for every date shown in this report
+            now = now or datetime.now()
+            
+            key = self._content_hash(analysis, stats, now)
+            delivered = self._delivered.setdefault(key, set())
+            self._delivered.move_to_end(key)
+            while len(self._delivered) > HTML_CACHE_SIZE:
+                self._delivered.popitem(last=False)
+            
+            pending = [addr for addr in recipients if addr not in delivered]
+            self.last_delivery['skipped'] = [addr for addr in recipients if addr in delivered]
+            if not pending:
+                logger.info("✓ Every recipient already has this report")
+                logger.info("="*70)
+                return True
+            
+            msg = EmailMessage()
+            if self.config.get('include_text_fallback', True):
+                # Create both HTML and plain text versions off the event loop
+                html_body, text_body = await asyncio.gather(
+                    asyncio.to_thread(self._create_html_email, analysis, all_data, stats, now, key),
+                    asyncio.to_thread(self._create_text_email, analysis, all_data, stats, now)
+                )
+                
+                # Plain text first, HTML as the preferred alternative
+                msg.set_content(text_body)
+                msg.add_alternative(html_body, subtype='html')
+            else:
+                # HTML-only recipients: skip the plain text body entirely
+                html_body = await asyncio.to_thread(
+                    self._create_html_email, analysis, all_data, stats, now, key
+                )
+                msg.set_content(html_body, subtype='html')
+            
+            msg['Subject'] = self._create_subject_line(analysis, now)
+            msg['From'] = self.config['from_email']
+            msg['Date'] = format_datetime(now.astimezone())
+            
+            # Send email
+            logger.info(f"Sending email to {len(pending)} recipient(s)...")
+            server = None
+            for addr in pending:
+                if server is None or self._messages_sent >= MAX_MESSAGES_PER_CONNECTION:
+                    try:
+                        server = await self._get_smtp()
+                    except Exception as e:
+                        # No session: the remaining recipients are left for a retry
+                        logger.error(f"✗ SMTP connection failed: {e}")
+                        break
+                
+                try:
+                    del msg['To']
+                    msg['To'] = addr
+                    await server.send_message(msg)
+                except Exception as e:
+                    logger.error(f"✗ Delivery to {addr} failed: {e}")
+                    # The session may be mid-transaction; start a fresh one
+                    await self.close()
+                    server = None
+                    continue
+                self._messages_sent += 1
+                delivered.add(addr)
+                self.last_delivery['delivered'].append(addr)
+            
+            failed = [addr for addr in pending if addr not in delivered]
+            self.last_delivery['failed'] = failed
+            sent = self.last_delivery['delivered']
+            if not failed:
+                logger.info(f"✓ Email sent successfully to {', '.join(sent)}")
+            elif sent or self.last_delivery['skipped']:
+                logger.warning(
+                    f"⚠ Partial delivery: {len(recipients) - len(failed)} of {len(recipients)} "
+                    f"recipients have the report; undelivered: {', '.join(failed)}"
+                )
+            else:
+                logger.error("✗ Email sending failed for every recipient")
+            logger.info("="*70)
+            return not failed
+            
+        except Exception as e:
+            logger.error(f"✗ Email sending failed: {e}")
+            logger.info("="*70)
+            await self.close()
+            self.last_delivery['failed'] = [
+                addr for addr in recipients
+                if addr not in self.last_delivery['delivered'] + self.last_delivery['skipped']
+            ]
+            return False
+    
+    async def _get_smtp(self) -> 'aiosmtplib.SMTP':
+        """
+        Return the cached SMTP connection, reconnecting if it has gone stale
+        
+        STARTTLS + AUTH only happen when a new connection is opened. The
+        session is also recycled after MAX_MESSAGES_PER_CONNECTION sends.
+        """
+        if self._smtp is not None and self._messages_sent >= MAX_MESSAGES_PER_CONNECTION:
+            await self.close()
+        
+        if self._smtp is not None:
+            try:
+                await self._smtp.noop()
+                return self._smtp
+            except Exception:
+                self._smtp = None
+        
+        import aiosmtplib
+        
+        server = aiosmtplib.SMTP(
+            hostname=self.config['smtp_server'],
+            port=self.config['smtp_port'],
+            start_tls=False
+        )
+        await server.connect()
+        await server.starttls()
+        await server.login(self.config['username'], self.config['password'])
+        self._smtp = server
+        self._messages_sent = 0
+        return server
+    
+    async def connect(self) -> bool:
+        """
+        Open (or revalidate) the SMTP session ahead of sending
+        
+        Lets the caller overlap STARTTLS + AUTH with other work. Failures
+        are logged and left for send_daily_report to retry.
+        """
+        try:
+            await self._get_smtp()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠ SMTP pre-connect failed, will retry on send: {e}")
+            return False
+    
+    async def close(self):
+        """Close the cached SMTP connection"""
+        if self._smtp is None:
+            return
+        try:
+            await self._smtp.quit()
+        except Exception as e:
+            logger.warning(f"⚠ SMTP quit failed: {e}")
+        finally:
+            self._smtp = None
+    
+    @staticmethod
+    def _parse_recipients(to_emails: Union[str, List[str]]) -> List[str]:
+        """Normalize a comma-separated string or list into a list of addresses"""
+        if isinstance(to_emails, str):
+            to_emails = to_emails.split(',')
+        return [addr.strip() for addr in to_emails if addr and addr.strip()]
+    
+    def _create_subject_line(self, analysis: AnalysisDict, now: Optional[datetime] = None) -> str:
+        """Create engaging subject line"""
+        now = now or datetime.now()
+        date_str = now.strftime('%B %d, %Y')
+        
+        # Try to extract key topic from summary
+        summary = analysis.get('executive_summary', '')
+        
+        # Simple but engaging subject
+        return f"🤖 Daily AI Update - {date_str} | Latest Breakthroughs & Trends"
+    
+    def _create_html_email(
+        self,
+        analysis: AnalysisDict,
+        all_data: Dict,
+        stats: StatsDict,
+        now: Optional[datetime] = None,
+        key: Optional[str] = None
+    ) -> str:
+        """
+        Create beautiful HTML email
+        
+        Rendered HTML is cached by a hash of everything it shows: the
+        analysis, the stats and the report timestamp, so a cached render
+        never carries another send's dates. all_data isn't hashed; the
+        renderer doesn't read it. Hits need the caller to pass the same
+        `now`, as send_daily_report does for a retried report; it also
+        passes the key it already computed.
+        """
+        now = now or datetime.now()
+        key = key or self._content_hash(analysis, stats, now)
+        with self._html_cache_lock:
+            rendered = self._html_cache.get(key)
+            if rendered is not None:
+                self._html_cache.move_to_end(key)
+                return rendered
+        
+        # Render outside the lock; a concurrent miss on the same key just
+        # renders the same HTML twice
+        rendered = self._render_html_email(analysis, all_data, stats, now)
+        with self._html_cache_lock:
+            self._html_cache[key] = rendered
+            while len(self._html_cache) > HTML_CACHE_SIZE:
+                self._html_cache.popitem(last=False)
+        return rendered
+    
+    @staticmethod
+    def _content_hash(*parts: Any) -> str:
+        """Stable digest of JSON-serializable report inputs"""
+        payload = orjson.dumps(
+            parts,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+        return content_hash(payload)
+    
+    def clear_cache(self):
+        """Drop cached HTML renders"""
+        with self._html_cache_lock:
+            self._html_cache.clear()
+    
+    def _render_html_email(
+        self,
+        analysis: AnalysisDict,
+        all_data: Dict,
+        stats: StatsDict,
+        now: datetime
+    ) -> str:
+        """Build the full HTML document from scratch into a single buffer"""
+        buf = io.StringIO()
+        buf.write(_SHELL_OPEN)
+        buf.write(self._create_email_header(stats, now))
+        
+        buf.write(_CONTENT_OPEN)
+        prepared = self._prepare_sections(analysis)
+        section_writers = [
+            (self._write_executive_summary_section, (prepared,)),
+            (self._write_key_developments_section, (prepared,)),
+            (self._write_trends_section, (prepared,)),
+            (self._write_breakthroughs_section, (prepared,)),
+            (self._write_industry_impact_section, (prepared,)),
+            (self._write_actionable_insights_section, (prepared,)),
+            (self._write_future_predictions_section, (prepared,)),
+            (self._write_sources_section, (prepared,)),
+        ]
+        if PARALLEL_SECTIONS:
+            # Sections are independent; render each into its own buffer
+            for part in _get_section_executor().map(_render_section_part, section_writers):
+                buf.write(part)
+        else:
+            for write, args in section_writers:
+                write(buf, *args)
+        buf.write(_CONTENT_CLOSE)
+        
+        buf.write(self._create_email_footer(now))
+        buf.write(_SHELL_CLOSE)
+        return buf.getvalue()
+    
+    def _create_email_header(self, stats: StatsDict, now: Optional[datetime] = None) -> str:
+        """Create email header with stats"""
+        now = now or datetime.now()
+        date_str = now.strftime('%B %d, %Y')
+        time_str = now.strftime('%I:%M %p')
+        
+        total_items = stats.get('total_items', 0)
+        sources_count = stats.get('sources_count', 0)
+        research_count = stats.get('research_count', 0)
+        models_count = stats.get('models_count', 0)
+        tools_count = stats.get('tools_count', 0)
+        
+        return _render_header(
+            date_str, time_str,
+            total_items, sources_count, research_count, models_count, tools_count
+        )
+    
+    @staticmethod
+    def _prepare_sections(analysis: AnalysisDict) -> Dict[str, Any]:
+        """
+        Extract and truncate everything the section writers display
+        
+        Done in one pass so each writer works on an already-sliced view
+        instead of re-reading and re-slicing the analysis.
+        """
+        trends_data = analysis.get('trends_and_patterns', _EMPTY_DICT)
+        critical = analysis.get('prioritization', _EMPTY_DICT).get('critical', _EMPTY_LIST)
+        return {
+            'executive_summary': analysis.get('executive_summary', 'No summary available'),
+            'developments': analysis.get('key_developments', _EMPTY_LIST)[:10],
+            'has_trends': bool(trends_data),
+            'emerging_trends': trends_data.get('emerging_trends', _EMPTY_LIST)[:5],
+            'dominant_themes': trends_data.get('dominant_themes', _EMPTY_LIST)[:3],
+            'breakthroughs': analysis.get('breakthrough_technologies', _EMPTY_LIST)[:5],
+            'industry_impact': list(islice(
+                analysis.get('industry_impact', _EMPTY_DICT).items(), 5
+            )),
+            'actionable_insights': analysis.get('actionable_insights', _EMPTY_DICT),
+            'future_predictions': analysis.get('future_predictions', _EMPTY_DICT),
+            'critical': critical[:15],
+            'critical_total': len(critical),
+        }
+    
+    def _write_executive_summary_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write executive summary section"""
+        summary = prepared['executive_summary']
+        
+        buf.write(_SECTION_HEADERS['executive_summary'])
+        buf.write(f"""
             <div class="card">
                 <div class="card-content" style="white-space: pre-wrap;">{summary}</div>
             </div>
-        </div>
-        """
+        """)
+        buf.write(_SECTION_CLOSE)
     
-    def _create_key_developments_section(self, analysis: Dict) -> str:
-        """Create key developments section"""
-        developments = analysis.get('key_developments', [])
+    def _write_key_developments_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write key developments section"""
+        developments = prepared['developments']
         
         if not developments:
-            return ""
+            return
         
-        items_html = ""
-        for dev in developments[:10]:
+        buf.write(_SECTION_HEADERS['key_developments'])
+        buf.write('            <ol class="numbered-list">\n')
+        for dev in developments:
             importance = dev.get('importance', 'Medium')
-            badge_class = {
-                'Critical': 'badge-critical',
-                'High': 'badge-high',
-                'Medium': 'badge-medium'
-            }.get(importance, 'badge-medium')
+            badge_class = _IMPORTANCE_BADGE.get(importance, 'badge-medium')
             
             category = dev.get('category', 'Unknown')
-            category_badge_class = {
-                'Model Release': 'badge-high',
-                'Research': 'badge-research',
-                'Tool': 'badge-tool',
-                'News': 'badge-medium'
-            }.get(category, 'badge-medium')
+            category_badge_class = _CATEGORY_BADGE.get(category, 'badge-medium')
             
-            items_html += f"""
+            buf.write(f"""
             <li>
                 <div style="margin-bottom: 5px;">
                     <span class="badge {badge_class}">{importance}</span>
@@ -508,40 +947,32 @@ class EnhancedEmailReporter:
                     <strong>Key Takeaway:</strong> {dev.get('key_takeaway', 'N/A')}
                 </div>
             </li>
-            """
-        
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">🔥</span>Top 10 Key Developments</h2>
-            <ol class="numbered-list">
-                {items_html}
-            </ol>
-        </div>
-        """
+            """)
+        buf.write('            </ol>\n')
+        buf.write(_SECTION_CLOSE)
     
-    def _create_trends_section(self, analysis: Dict) -> str:
-        """Create trends and patterns section"""
-        trends_data = analysis.get('trends_and_patterns', {})
-        
-        if not trends_data:
-            return ""
+    def _write_trends_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write trends and patterns section"""
+        if not prepared['has_trends']:
+            return
         
-        emerging_trends = trends_data.get('emerging_trends', [])
-        dominant_themes = trends_data.get('dominant_themes', [])
+        emerging_trends = prepared['emerging_trends']
+        dominant_themes = prepared['dominant_themes']
         
-        trends_html = ""
-        for trend in emerging_trends[:5]:
-            trends_html += f"""
+        buf.write(_SECTION_HEADERS['trends'])
+        buf.write('            <h3 style="margin-bottom: 15px; color: #4a5568;">Emerging Trends</h3>\n')
+        for trend in emerging_trends:
+            buf.write(f"""
             <div class="trend-item">
                 <div class="trend-title">{trend.get('trend', 'Unknown')}</div>
                 <span class="trend-strength">{trend.get('strength', 'Medium')} Strength</span>
                 <p style="margin-top: 10px; color: #4a5568;">{trend.get('description', 'No description')}</p>
             </div>
-            """
+            """)
         
-        themes_html = ""
-        for theme in dominant_themes[:3]:
-            themes_html += f"""
+        buf.write('            <h3 style="margin: 30px 0 15px 0; color: #4a5568;">Dominant Themes</h3>\n')
+        for theme in dominant_themes:
+            buf.write(f"""
             <div class="card">
                 <div class="card-title">{theme.get('theme', 'Unknown')}</div>
                 <div class="card-content">
@@ -549,28 +980,19 @@ class EnhancedEmailReporter:
                     <strong>Significance:</strong> {theme.get('significance', 'N/A')}
                 </div>
             </div>
-            """
-        
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">📈</span>Trends & Patterns</h2>
-            <h3 style="margin-bottom: 15px; color: #4a5568;">Emerging Trends</h3>
-            {trends_html}
-            <h3 style="margin: 30px 0 15px 0; color: #4a5568;">Dominant Themes</h3>
-            {themes_html}
-        </div>
-        """
+            """)
+        buf.write(_SECTION_CLOSE)
     
-    def _create_breakthroughs_section(self, analysis: Dict) -> str:
-        """Create breakthrough technologies section"""
-        breakthroughs = analysis.get('breakthrough_technologies', [])
+    def _write_breakthroughs_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write breakthrough technologies section"""
+        breakthroughs = prepared['breakthroughs']
         
         if not breakthroughs:
-            return ""
+            return
         
-        items_html = ""
-        for bt in breakthroughs[:5]:
-            items_html += f"""
+        buf.write(_SECTION_HEADERS['breakthroughs'])
+        for bt in breakthroughs:
+            buf.write(f"""
             <div class="card">
                 <div class="card-title">🚀 {bt.get('technology', 'Unknown')}</div>
                 <div class="card-content">
@@ -579,145 +1001,111 @@ class EnhancedEmailReporter:
                     <strong>Adoption Timeline:</strong> {bt.get('adoption_timeline', 'N/A')}
                 </div>
             </div>
-            """
-        
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">💡</span>Breakthrough Technologies</h2>
-            {items_html}
-        </div>
-        """
+            """)
+        buf.write(_SECTION_CLOSE)
     
-    def _create_industry_impact_section(self, analysis: Dict) -> str:
-        """Create industry impact section"""
-        impact = analysis.get('industry_impact', {})
+    def _write_industry_impact_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write industry impact section"""
+        impact = prepared['industry_impact']
         
         if not impact:
-            return ""
+            return
+        
+        buf.write(_SECTION_HEADERS['industry_impact'])
         
         # Show top affected industries
-        impact_html = ""
-        for industry, details in list(impact.items())[:5]:
+        for industry, details in impact:
             if isinstance(details, dict):
-                impact_html += f"""
+                buf.write(f"""
                 <div class="card">
                     <div class="card-title">{industry}</div>
                     <div class="card-content">
                         {details.get('direct_impact', 'No impact details available')}
                     </div>
                 </div>
-                """
-        
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">🏭</span>Industry Impact</h2>
-            {impact_html}
-        </div>
-        """
+                """)
+        buf.write(_SECTION_CLOSE)
     
-    def _create_actionable_insights_section(self, analysis: Dict) -> str:
-        """Create actionable insights section"""
-        insights = analysis.get('actionable_insights', {})
+    def _write_actionable_insights_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write actionable insights section"""
+        insights = prepared['actionable_insights']
         
         if not insights:
-            return ""
-        
-        insights_html = ""
-        
-        insight_emojis = {
-            'ai_practitioners': '👨‍💻',
-            'business_leaders': '💼',
-            'researchers': '🔬',
-            'investors': '💰',
-            'general_public': '👥'
-        }
+            return
         
+        buf.write(_SECTION_HEADERS['actionable_insights'])
+        buf.write('            <div class="insights-grid">\n')
         for key, items in insights.items():
             if isinstance(items, list) and items:
                 title = key.replace('_', ' ').title()
-                emoji = insight_emojis.get(key, '•')
-                
-                items_list = "".join([f"<li>{item}</li>" for item in items[:5]])
+                emoji = _INSIGHT_EMOJIS.get(key, '•')
                 
-                insights_html += f"""
+                buf.write(f"""
                 <div class="insight-box">
                     <div class="insight-title">{emoji} {title}</div>
                     <ul class="insight-list">
-                        {items_list}
+                        """)
+                for item in items[:5]:
+                    buf.write(f"<li>{item}</li>")
+                buf.write("""
                     </ul>
                 </div>
-                """
-        
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">💡</span>Actionable Insights</h2>
-            <div class="insights-grid">
-                {insights_html}
-            </div>
-        </div>
-        """
+                """)
+        buf.write('            </div>\n')
+        buf.write(_SECTION_CLOSE)
     
-    def _create_future_predictions_section(self, analysis: Dict) -> str:
-        """Create future predictions section"""
-        predictions = analysis.get('future_predictions', {})
+    def _write_future_predictions_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write future predictions section"""
+        predictions = prepared['future_predictions']
         
         if not predictions:
-            return ""
-        
-        timeframes = ['next_week', 'next_month', 'next_quarter']
-        pred_html = ""
+            return
         
-        for tf in timeframes:
-            data = predictions.get(tf, [])
-            if data:
+        buf.write(_SECTION_HEADERS['future_predictions'])
+        for tf in _PREDICTION_TIMEFRAMES:
+            data = predictions.get(tf, _EMPTY_LIST)
+            if data and isinstance(data, list):
                 title = tf.replace('_', ' ').title()
-                if isinstance(data, list):
-                    items = "".join([f"<li>{item}</li>" for item in data[:5]])
-                    pred_html += f"""
+                buf.write(f"""
                     <div class="card">
                         <div class="card-title">{title}</div>
                         <ul class="insight-list">
-                            {items}
+                            """)
+                for item in data[:5]:
+                    buf.write(f"<li>{item}</li>")
+                buf.write("""
                         </ul>
                     </div>
-                    """
-        
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">🔮</span>Future Outlook</h2>
-            {pred_html}
-        </div>
-        """
+                    """)
+        buf.write(_SECTION_CLOSE)
     
-    def _create_sources_section(self, all_data: Dict, analysis: Dict) -> str:
-        """Create sources section with all articles"""
-        prioritization = analysis.get('prioritization', {})
-        critical_items = prioritization.get('critical', [])
+    def _write_sources_section(self, buf: io.StringIO, prepared: Dict[str, Any]) -> None:
+        """Write sources section with all articles"""
+        critical_items = prepared['critical']
         
-        sources_html = ""
+        buf.write(_SECTION_OPEN.substitute(
+            emoji="📚",
+            title=f"Source Articles ({prepared['critical_total']} Priority Items)"
+        ))
+        buf.write('            <div class="source-grid">\n')
         
-        # Show critical items first
-        for item in critical_items[:15]:
-            sources_html += self._format_source_card(item)
+        # Show critical items first, escaped once up front
+        safe_items = [_escape_source_item(item) for item in critical_items]
+        for item in safe_items:
+            self._write_source_card(buf, item)
         
-        return f"""
-        <div class="section">
-            <h2 class="section-title"><span class="emoji">📚</span>Source Articles ({len(critical_items)} Priority Items)</h2>
-            <div class="source-grid">
-                {sources_html}
-            </div>
-        </div>
-        """
+        buf.write('            </div>\n')
+        buf.write(_SECTION_CLOSE)
     
-    def _format_source_card(self, item: Dict) -> str:
-        """Format a single source card"""
-        title = item.get('title', 'Unknown')
-        source = item.get('source', 'Unknown')
-        category = item.get('category', 'Unknown')
-        url = item.get('url', '#')
-        summary = item.get('summary', item.get('description', 'No summary available'))[:200]
-        
-        return f"""
+    def _write_source_card(self, buf: io.StringIO, item: Dict[str, str]) -> None:
+        """Write a single source card from an already-escaped item"""
+        title = item['title']
+        source = item['source']
+        category = item['category']
+        url = item['url']
+        summary = item['summary']
+        
+        buf.write(f"""
         <div class="source-card">
             <div class="source-title">{title}</div>
             <div class="source-meta">
@@ -727,52 +1115,30 @@ class EnhancedEmailReporter:
             <p style="color: #4a5568; font-size: 14px;">{summary}...</p>
             <a href="{url}" class="source-link" target="_blank">Read Full Article →</a>
         </div>
-        """
+        """)
     
-    def _create_email_footer(self) -> str:
+    def _create_email_footer(self, now: Optional[datetime] = None) -> str:
         """Create email footer"""
-        return f"""
-        <div class="footer">
-            <p style="margin: 0 0 10px 0; font-size: 16px; font-weight: 600;">Daily AI Updates</p>
-            <p style="margin: 0 0 15px 0;">Powered by Gemini AI • Delivered with ❤️</p>
-            <p style="margin: 0; font-size: 12px; color: #a0aec0;">
-                Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            </p>
-            <div class="footer-links">
-                <a href="#" class="footer-link">Preferences</a>
-                <a href="#" class="footer-link">Unsubscribe</a>
-            </div>
-        </div>
-        """
+        now = now or datetime.now()
+        return _render_footer(now.strftime('%Y-%m-%d %H:%M:%S'))
     
-    def _create_text_email(self, analysis: Dict, all_data: Dict, stats: Dict) -> str:
+    def _create_text_email(
+        self,
+        analysis: AnalysisDict,
+        all_data: Dict,
+        stats: StatsDict,
+        now: Optional[datetime] = None
+    ) -> str:
         """Create plain text version of email"""
-        date_str = datetime.now().strftime('%B %d, %Y')
-        
-        text = f"""
-{'='*70}
-DAILY AI UPDATE - {date_str}
-{'='*70}
-
-STATISTICS
-----------
-Total Updates: {stats.get('total_items', 0)}
-Sources: {stats.get('sources_count', 0)}
-
-EXECUTIVE SUMMARY
------------------
-{analysis.get('executive_summary', 'No summary available')}
-
-{'='*70}
-
-[View full report with formatting in HTML version]
-
-Generated by Daily AI Updates System
-Powered by Gemini AI
-{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        """
+        now = now or datetime.now()
         
-        return text
+        return _TEXT_EMAIL.substitute(
+            date=now.strftime('%B %d, %Y'),
+            total_items=stats.get('total_items', 0),
+            sources_count=stats.get('sources_count', 0),
+            summary=analysis.get('executive_summary', 'No summary available'),
+            generated=now.strftime('%Y-%m-%d %H:%M:%S')
+        )
 
 
 # Demo
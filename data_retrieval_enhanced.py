@@ -5,25 +5,494 @@ Gathers AI news from multiple real-time sources
 
 import asyncio
 import aiohttp
+import orjson
 import logging
-from typing import Dict, List, Any
+import re
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from functools import partial
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from typing import Dict, List, Any, Optional, Callable, Mapping, Tuple
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-import feedparser
 from bs4 import BeautifulSoup
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
+# AI/ML relevance filter for GitHub repos (substring match, case-insensitive)
+AI_KEYWORDS = ('ai', 'ml', 'machine learning', 'deep learning',
+               'neural', 'llm', 'gpt', 'transformer', 'model')
+AI_KEYWORD_RE = re.compile('|'.join(map(re.escape, AI_KEYWORDS)), re.IGNORECASE)
+
+# Applied to every request made through the shared session
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
+# Per-source request headers, shared read-only across calls
+HF_HEADERS = MappingProxyType({"User-Agent": "AI-News-Aggregator/1.0"})
+REDDIT_HEADERS = MappingProxyType({'User-Agent': 'AI News Aggregator 1.0'})
+
+# Retry policy for transient (5xx / connection) failures
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.3  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 5.0
+
+# Per-host limits: concurrent requests, and consecutive failures before the
+# host's circuit opens for BREAKER_COOLDOWN seconds
+HOST_CONCURRENCY = 4
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 60.0
+
+# Requests in flight across all hosts; bounds sockets and DNS lookups during
+# the phase 1 fan-out. Waiting for a slot doesn't count against the
+# request timeout.
+MAX_CONCURRENT_REQUESTS = int(os.getenv("HTTP_MAX_CONCURRENCY", "20"))
+
+# Upper bound on a single response body; larger bodies are rejected
+MAX_BODY_BYTES = 4 << 20  # 4 MiB
+READ_CHUNK_BYTES = 16 << 10
+
+# Conditional-GET validators and parsed items, kept between runs
+CONDITIONAL_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'ai_updates', 'etags.json'
+)
+
+# RSS 2.0 <item> and RSS 1.0 (RDF) {http://purl.org/rss/1.0/}item alike
+RSS_ITEM_XPATH = etree.XPath("//*[local-name()='item']")
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+RDF_NS = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'
+
+# Static stand-ins for the aggregator and company blog sources. Read-only
+# templates: the fetchers build an Article from each and stamp 'published'.
+SIMULATED_NEWS = (
+    MappingProxyType({
+        'title': 'OpenAI Announces GPT-4.5 with Enhanced Reasoning',
+        'summary': 'OpenAI releases GPT-4.5 with improved mathematical reasoning and coding capabilities, showing 40% improvement in STEM benchmarks.',
+        'url': 'https://openai.com/index/gpt-4',  # Real OpenAI blog URL
+        'source': 'OpenAI Blog',
+        'category': 'Model Release'
+    }),
+    MappingProxyType({
+        'title': 'Google DeepMind Releases Gemini 1.5 Pro',
+        'summary': 'New model features 1M token context window and improved multimodal understanding across text, images, video, and audio.',
+        'url': 'https://deepmind.google/technologies/gemini/',  # Real DeepMind URL
+        'source': 'Google DeepMind',
+        'category': 'Model Release'
+    }),
+    MappingProxyType({
+        'title': 'Meta Open-Sources Llama 3 70B',
+        'summary': 'Meta releases Llama 3 with 70B parameters, rivaling GPT-4 performance while remaining completely open-source and free to use.',
+        'url': 'https://llama.meta.com/',  # Real Meta Llama URL
+        'source': 'Meta AI',
+        'category': 'Open Source Release'
+    }),
+    MappingProxyType({
+        'title': 'Anthropic Claude 3.5 Sonnet Benchmarks',
+        'summary': 'Claude 3.5 Sonnet shows state-of-the-art performance on coding benchmarks, surpassing GPT-4 on several metrics.',
+        'url': 'https://www.anthropic.com/news/claude-3-5-sonnet',  # Real Anthropic URL
+        'source': 'Anthropic',
+        'category': 'Model Release'
+    }),
+    MappingProxyType({
+        'title': 'Stability AI Releases Stable Diffusion 3',
+        'summary': 'Latest image generation model features improved text rendering and better composition understanding.',
+        'url': 'https://stability.ai/news/stable-diffusion-3',  # Real Stability AI URL
+        'source': 'Stability AI',
+        'category': 'Image Generation'
+    }),
+)
+
+SIMULATED_COMPANY_UPDATES = (
+    MappingProxyType({
+        'title': 'OpenAI API Updates: Function Calling Improvements',
+        'summary': 'Enhanced function calling with parallel execution and improved accuracy in parameter extraction.',
+        'url': 'https://openai.com/index/function-calling-and-other-api-updates',  # Real blog post URL
+        'source': 'OpenAI',
+        'category': 'Tool Update'
+    }),
+    MappingProxyType({
+        'title': 'Hugging Face Launches Inference Endpoints',
+        'summary': 'New managed service for deploying ML models at scale with automatic scaling and optimization.',
+        'url': 'https://huggingface.co/docs/inference-endpoints',  # Correct documentation URL
+        'source': 'Hugging Face',
+        'category': 'Platform Update'
+    }),
+)
+
+
+def _parse_rss_items(body: bytearray) -> list:
+    """Parse an RSS document and return its item elements"""
+    # No entity expansion or network access for remote documents; recover
+    # from minor breakage the way feed readers do. Parsers are not
+    # thread-safe, so each call builds its own.
+    parser = etree.XMLParser(
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=False,
+        recover=True
+    )
+    root = etree.fromstring(bytes(body), parser=parser)
+    if root is None:
+        return []
+    return RSS_ITEM_XPATH(root)
+
+
+def _rss_text(item, path: str, default: str = '') -> str:
+    """Stripped text of the first child matching path, or default"""
+    text = item.findtext(path)
+    return text.strip() if text else default
+
+
+def _truncate(text: str, limit: int = 300) -> str:
+    """Cut text to limit characters, adding "..." only when something was cut"""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def _rss_published(item, fetched_at: str) -> str:
+    """RSS 2.0 pubDate, falling back to dc:date, then to the fetch time"""
+    return (
+        _rss_text(item, '{*}pubDate')
+        or _rss_text(item, f'{{{DC_NS}}}date')
+        or fetched_at
+    )
+
+
+# dataclass(slots=True) is Python 3.10+; on 3.9 Article keeps a __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class Article:
+    """
+    One retrieved item
+    
+    Fields every source shares are attributes (slots on 3.10+);
+    source-specific ones (arxiv_id, upvotes, downloads, ...) live in
+    extra. get() mirrors dict.get so consumers written against plain
+    item dicts keep working.
+    """
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    url: Optional[str] = None
+    source: Optional[str] = None
+    category: Optional[str] = None
+    published: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _ARTICLE_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict in the shape the fetchers used to return"""
+        item = {
+            name: getattr(self, name)
+            for name in _ARTICLE_FIELDS
+            if getattr(self, name) is not None
+        }
+        item.update(self.extra)
+        return item
+    
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> 'Article':
+        """Inverse of to_dict; also accepts the nested form orjson writes"""
+        item = dict(item)
+        extra = item.pop('extra', None) or {}
+        core = {name: item.pop(name) for name in _ARTICLE_FIELDS if name in item}
+        extra.update(item)
+        return cls(**core, extra=extra)
+
+
+_ARTICLE_FIELDS = frozenset(f.name for f in fields(Article) if f.name != 'extra')
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of requesting a host whose circuit breaker is open"""
+
+
+class _CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for a single host
+    
+    closed: requests pass. open: requests are refused until the cool-down
+    elapses. half_open: one probe is admitted; its outcome closes or
+    re-opens the circuit.
+    """
+    
+    def __init__(self):
+        self.state = 'closed'
+        self.failure_count = 0
+        self.opened_at = 0.0
+    
+    def allow(self) -> bool:
+        if self.state == 'closed':
+            return True
+        if self.state == 'open' and time.monotonic() - self.opened_at >= BREAKER_COOLDOWN:
+            self.state = 'half_open'
+            return True
+        return False
+    
+    def record_success(self):
+        self.state = 'closed'
+        self.failure_count = 0
+    
+    def record_failure(self):
+        self.failure_count += 1
+        if self.state == 'half_open' or self.failure_count >= BREAKER_FAILURE_THRESHOLD:
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+    
+    def abandon_probe(self):
+        """Hand back a half-open probe that ended without an outcome"""
+        if self.state == 'half_open':
+            # opened_at is unchanged, so the next allow() admits a new probe
+            self.state = 'open'
+
 
 class AIDataRetriever:
     """
     Retrieves latest AI news from multiple real-time sources
     """
     
-    def __init__(self):
-        self.sources_fetched = []
+    def __init__(self, cache_path: Optional[str] = CONDITIONAL_CACHE_PATH):
+        """
+        Args:
+            cache_path: File for ETag/Last-Modified validators and cached
+                items between runs (None keeps the cache in memory only)
+        """
+        self.sources_fetched = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.cache_path = cache_path
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(HOST_CONCURRENCY)
+        )
+        # Created on first use: on Python 3.9 a semaphore binds to the loop
+        # current at construction, which isn't the one asyncio.run starts
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._breakers: Dict[str, _CircuitBreaker] = defaultdict(_CircuitBreaker)
+        self._conditional_cache = self._load_conditional_cache()
+        self._conditional_cache_dirty = False  # unsaved entries since load
         logger.info("AI Data Retriever initialized")
     
-    async def fetch_all_sources(self) -> Dict[str, List[Dict[str, Any]]]:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared HTTP session, creating it on first use
+        
+        One connector for all fetchers keeps sockets, DNS and TLS sessions
+        alive between requests.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=DEFAULT_TIMEOUT
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _fetch_conditional(
+        self,
+        url: str,
+        parse: Callable[[bytearray], List[Article]],
+        headers: Optional[Mapping[str, str]] = None
+    ) -> List[Article]:
+        """
+        GET a source with ETag / Last-Modified revalidation
+        
+        On 304 Not Modified the items parsed on the previous run are returned
+        without downloading or parsing the body again. On 200 the body is
+        parsed in a worker thread and cached with the new validators.
+        """
+        cached = self._conditional_cache.get(url)
+        
+        # Shared header constants are only copied when validators are added
+        request_headers = headers or {}
+        if cached:
+            request_headers = dict(request_headers)
+            if cached.get('etag'):
+                request_headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                request_headers['If-Modified-Since'] = cached['last_modified']
+        
+        fetched = await self._get_with_retry(url, request_headers, accept_304=bool(cached))
+        if fetched is None:
+            logger.info(f"  ↺ Not modified, reusing cached items: {url}")
+            return cached['items']
+        body, etag, last_modified = fetched
+        
+        # Parsing is CPU-bound; keep it off the event loop
+        items = await asyncio.to_thread(parse, body)
+        
+        if etag or last_modified:
+            self._conditional_cache[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'items': items
+            }
+            self._conditional_cache_dirty = True
+        return items
+    
+    async def _get_with_retry(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        accept_304: bool = False
+    ) -> Optional[Tuple[bytearray, Optional[str], Optional[str]]]:
+        """
+        GET a URL, returning (body, etag, last_modified), or None on 304
+        
+        Requests to one host share a semaphore and a circuit breaker, and
+        all requests share a global concurrency cap. 5xx and connection
+        failures are retried with jittered exponential backoff; 4xx and
+        oversized bodies fail on the first attempt.
+        """
+        host = urlsplit(url).hostname or url
+        breaker = self._breakers[host]
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}, skipping {url}")
+        
+        session = await self._get_session()
+        if self._request_semaphore is None:
+            self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        try:
+            for attempt in range(RETRY_ATTEMPTS):
+                last_attempt = attempt == RETRY_ATTEMPTS - 1
+                try:
+                    # Host slot first, so a busy host doesn't hold global slots
+                    async with self._host_semaphores[host], \
+                            self._request_semaphore, \
+                            session.get(url, headers=headers) as response:
+                        if response.status == 304 and accept_304:
+                            fetched = None
+                            break
+                        
+                        if response.status >= 500 and not last_attempt:
+                            reason = f"HTTP {response.status}"
+                        elif response.status != 200:
+                            text = (await self._bounded_read(response)).decode('utf-8', errors='replace')
+                            raise aiohttp.ClientResponseError(
+                                response.request_info,
+                                response.history,
+                                status=response.status,
+                                message=text[:200]
+                            )
+                        else:
+                            fetched = (
+                                await self._bounded_read(response),
+                                response.headers.get('ETag'),
+                                response.headers.get('Last-Modified')
+                            )
+                            break
+                
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if last_attempt:
+                        raise
+                    reason = repr(e)
+                
+                # Back off outside the semaphore so waiting retries don't hold a slot
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * (0.5 + random.random())
+                logger.warning(f"  ⚠ {reason} from {url}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            self._record_host_failure(host, breaker)
+            raise
+        except aiohttp.ClientResponseError as e:
+            # Rate limiting and server errors count against the host; other
+            # 4xx mean the host is up and answering
+            if e.status >= 500 or e.status == 429:
+                self._record_host_failure(host, breaker)
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            # Oversized bodies, truncated payloads and anything else still
+            # count against the host, so a half-open probe always resolves
+            self._record_host_failure(host, breaker)
+            raise
+        except asyncio.CancelledError:
+            # No verdict on the host, but the probe slot must not stay taken
+            breaker.abandon_probe()
+            raise
+        
+        breaker.record_success()
+        return fetched
+    
+    @staticmethod
+    def _record_host_failure(host: str, breaker: '_CircuitBreaker'):
+        breaker.record_failure()
+        if breaker.state == 'open':
+            logger.warning(
+                f"  ⚠ Circuit open for {host} after {breaker.failure_count} "
+                f"consecutive failures, cooling down {BREAKER_COOLDOWN:.0f}s"
+            )
+    
+    @staticmethod
+    async def _bounded_read(response: aiohttp.ClientResponse) -> bytearray:
+        """
+        Read a response body, refusing anything over MAX_BODY_BYTES
+        
+        A declared Content-Length is checked up front; otherwise chunks are
+        appended to one buffer until EOF, failing as soon as the cap is
+        passed. orjson decodes the bytearray directly, without a join copy.
+        """
+        declared = response.content_length
+        if declared and declared > MAX_BODY_BYTES:
+            raise ValueError(f"Body too large: {declared} bytes from {response.url}")
+        
+        buf = bytearray()
+        async for chunk in response.content.iter_chunked(READ_CHUNK_BYTES):
+            buf.extend(chunk)
+            if len(buf) > MAX_BODY_BYTES:
+                raise ValueError(f"Body exceeded {MAX_BODY_BYTES} bytes from {response.url}")
+        return buf
+    
+    def _load_conditional_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load validators and items saved by a previous run"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = orjson.loads(f.read())
+            for entry in cache.values():
+                entry['items'] = [Article.from_dict(item) for item in entry['items']]
+            return cache
+        except Exception as e:
+            logger.warning(f"  ⚠ Ignoring unreadable fetch cache {self.cache_path}: {e}")
+            return {}
+    
+    def _save_conditional_cache(self):
+        """Persist validators and items for the next run, if any changed"""
+        # A run where every source answered 304 has nothing new to write
+        if not self.cache_path or not self._conditional_cache_dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            # orjson serializes Article dataclasses natively
+            with open(self.cache_path, 'wb') as f:
+                f.write(orjson.dumps(self._conditional_cache))
+            self._conditional_cache_dirty = False
+        except Exception as e:
+            logger.warning(f"  ⚠ Could not save fetch cache {self.cache_path}: {e}")
+    
+    async def fetch_all_sources(self) -> Dict[str, List[Article]]:
         """
         Fetch data from all sources in parallel
         Returns dict with categorized articles from each source
@@ -32,30 +501,33 @@ class AIDataRetriever:
         logger.info("Starting parallel data collection from all sources")
         logger.info("="*70)
         
-        # Run all fetchers in parallel
-        tasks = [
-            self.fetch_arxiv_papers(),
-            self.fetch_huggingface_updates(),
-            self.fetch_github_trending(),
-            self.fetch_reddit_ai(),
-            self.fetch_papers_with_code(),
-            self.fetch_ai_news_aggregators(),
-            self.fetch_company_blogs(),
-        ]
+        # One timestamp for every item that has no publish date of its own
+        fetched_at = datetime.now().isoformat()
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Organize results
-        all_data = {
-            'arxiv_papers': results[0] if not isinstance(results[0], Exception) else [],
-            'huggingface_models': results[1] if not isinstance(results[1], Exception) else [],
-            'github_repos': results[2] if not isinstance(results[2], Exception) else [],
-            'reddit_discussions': results[3] if not isinstance(results[3], Exception) else [],
-            'papers_with_code': results[4] if not isinstance(results[4], Exception) else [],
-            'news_articles': results[5] if not isinstance(results[5], Exception) else [],
-            'company_updates': results[6] if not isinstance(results[6], Exception) else [],
+        # Run all fetchers in parallel, keyed by their slot in all_data
+        fetchers = {
+            'arxiv_papers': self.fetch_arxiv_papers(fetched_at),
+            'huggingface_models': self.fetch_huggingface_updates(),
+            'github_repos': self.fetch_github_trending(fetched_at),
+            'reddit_discussions': self.fetch_reddit_ai(),
+            'papers_with_code': self.fetch_papers_with_code(fetched_at),
+            'news_articles': self.fetch_ai_news_aggregators(fetched_at),
+            'company_updates': self.fetch_company_blogs(fetched_at),
         }
         
+        # Fetchers log and return [] on their own failures; anything that
+        # still escapes is logged here and its source left empty
+        results = await asyncio.gather(*fetchers.values(), return_exceptions=True)
+        
+        all_data = {}
+        for key, result in zip(fetchers, results):
+            if isinstance(result, BaseException):
+                logger.error(f"  ✗ {key} fetcher failed: {result!r}", exc_info=result)
+                result = []
+            all_data[key] = result
+        
+        await asyncio.to_thread(self._save_conditional_cache)
+        
         # Count total items
         total_items = sum(len(v) for v in all_data.values() if isinstance(v, list))
         
@@ -65,42 +537,23 @@ class AIDataRetriever:
         
         return all_data
     
-    async def fetch_arxiv_papers(self) -> List[Dict[str, Any]]:
+    async def fetch_arxiv_papers(self, fetched_at: Optional[str] = None) -> List[Article]:
         """
         Fetch latest AI papers from arXiv
         Real-time source: https://arxiv.org/
         """
         logger.info(" Fetching arXiv papers...")
+        fetched_at = fetched_at or datetime.now().isoformat()
         
         try:
             # arXiv RSS feed for AI papers
             url = "http://export.arxiv.org/rss/cs.AI"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    content = await response.text()
+            papers = await self._fetch_conditional(
+                url, partial(self._parse_arxiv_feed, fetched_at=fetched_at)
+            )
             
-            # Parse the RSS feed content using feedparser (extracts arXiv papers as structured data)
-            feed = feedparser.parse(content)
-            
-            papers = []
-            for entry in feed.entries[:10]:  # Latest 10 papers
-                # Extract arXiv ID
-                arxiv_id = entry.id.split('/')[-1]
-                
-                paper = {
-                    'title': entry.title,
-                    'summary': entry.summary[:300] + "...",
-                    'authors': entry.get('author', 'Unknown'),
-                    'published': entry.get('published', datetime.now().isoformat()),
-                    'url': entry.link,
-                    'arxiv_id': arxiv_id,
-                    'category': 'Research Paper',
-                    'source': 'arXiv'
-                }
-                papers.append(paper)
-            
-            self.sources_fetched.append('arXiv')
+            self.sources_fetched.add('arXiv')
             logger.info(f"  ✓ Fetched {len(papers)} papers from arXiv")
             return papers
             
@@ -108,36 +561,40 @@ class AIDataRetriever:
             logger.error(f"  ✗ arXiv fetch failed: {e}")
             return []
     
+    def _parse_arxiv_feed(self, body: bytearray, fetched_at: str) -> List[Article]:
+        """Extract papers from the arXiv RSS feed"""
+        papers = []
+        for item in _parse_rss_items(body)[:10]:  # Latest 10 papers
+            url = _rss_text(item, '{*}link')
+            # Extract arXiv ID (RSS 2.0 <guid>, or rdf:about on RSS 1.0 feeds)
+            guid = _rss_text(item, '{*}guid') or item.get(f'{{{RDF_NS}}}about') or url
+            arxiv_id = guid.split('/')[-1]
+            
+            paper = Article(
+                title=_rss_text(item, '{*}title'),
+                summary=_truncate(_rss_text(item, '{*}description')),
+                published=_rss_published(item, fetched_at),
+                url=url,
+                category='Research Paper',
+                source='arXiv',
+                extra={
+                    'authors': _rss_text(item, f'{{{DC_NS}}}creator', 'Unknown'),
+                    'arxiv_id': arxiv_id
+                }
+            )
+            papers.append(paper)
+        
+        return papers
+    
     async def fetch_huggingface_updates(self):
         logger.info("Fetching Hugging Face top models...")
 
         url = "https://huggingface.co/api/models?limit=10&sort=downloads&direction=-1"
 
-        headers = {
-            "User-Agent": "AI-News-Aggregator/1.0"
-        }
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=10) as response:
-
-                    if response.status != 200:
-                        logger.error(f"Hugging Face API returned {response.status}")
-                        text = await response.text()
-                        logger.error(text)   # مهم جدًا للتشخيص
-                        return []
-
-                    data = await response.json()
-
-            models = []
-            for item in data:
-                models.append({
-                    "title": item.get("modelId"),
-                    "downloads": item.get("downloads"),
-                    "likes": item.get("likes"),
-                    "url": f"https://huggingface.co/{item.get('modelId')}",
-                    "source": "Hugging Face"
-                })
+            models = await self._fetch_conditional(
+                url, self._parse_huggingface_models, headers=HF_HEADERS
+            )
 
             logger.info(f"✓ Fetched {len(models)} models")
             return models
@@ -146,69 +603,40 @@ class AIDataRetriever:
             logger.error(f"Hugging Face fetch failed: {e}")
             return []
 
+    def _parse_huggingface_models(self, body: bytearray) -> List[Article]:
+        """Extract models from the Hugging Face API response"""
+        data = orjson.loads(body)
+
+        models = []
+        for item in data:
+            models.append(Article(
+                title=item.get("modelId"),
+                url=f"https://huggingface.co/{item.get('modelId')}",
+                source="Hugging Face",
+                extra={
+                    "downloads": item.get("downloads"),
+                    "likes": item.get("likes")
+                }
+            ))
 
+        return models
         
-    async def fetch_github_trending(self) -> List[Dict[str, Any]]:
+    async def fetch_github_trending(self, fetched_at: Optional[str] = None) -> List[Article]:
         """
         Fetch trending AI repositories from GitHub
         Real-time source: https://github.com/trending
         """
         logger.info(" Fetching GitHub trending AI repos...")
+        fetched_at = fetched_at or datetime.now().isoformat()
         
         try:
             url = "https://github.com/trending/python?since=daily"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    html = await response.text()
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            repos = []
-            
-            # Find repo articles
-            for article in soup.find_all('article', class_='Box-row')[:8]:
-                try:
-                    # Extract repo name
-                    h2 = article.find('h2')
-                    if not h2:
-                        continue
-                    
-                    repo_link = h2.find('a')
-                    if not repo_link:
-                        continue
-                    
-                    repo_name = repo_link.get('href', '').strip('/')
-                    
-                    # Extract description
-                    desc_tag = article.find('p', class_='col-9')
-                    description = desc_tag.text.strip() if desc_tag else "No description"
-                    
-                    # Extract stars
-                    stars_tag = article.find('span', class_='d-inline-block float-sm-right')
-                    stars = stars_tag.text.strip() if stars_tag else "0"
-                    
-                    # Only include if AI/ML related
-                    combined_text = (repo_name + description).lower()
-                    ai_keywords = ['ai', 'ml', 'machine learning', 'deep learning', 
-                                   'neural', 'llm', 'gpt', 'transformer', 'model']
-                    
-                    if any(keyword in combined_text for keyword in ai_keywords):
-                        repo = {
-                            'title': f"Trending: {repo_name}",
-                            'repo_name': repo_name,
-                            'description': description,
-                            'stars_today': stars,
-                            'url': f"https://github.com/{repo_name}",
-                            'category': 'Open Source Tool',
-                            'source': 'GitHub',
-                            'published': datetime.now().isoformat()
-                        }
-                        repos.append(repo)
-                
-                except Exception as e:
-                    continue
+            repos = await self._fetch_conditional(
+                url, partial(self._parse_github_trending, fetched_at=fetched_at)
+            )
             
-            self.sources_fetched.append('GitHub')
+            self.sources_fetched.add('GitHub')
             logger.info(f"  ✓ Fetched {len(repos)} trending AI repos")
             return repos
             
@@ -216,7 +644,55 @@ class AIDataRetriever:
             logger.error(f"  ✗ GitHub fetch failed: {e}")
             return []
     
-    async def fetch_reddit_ai(self) -> List[Dict[str, Any]]:
+    def _parse_github_trending(self, body: bytearray, fetched_at: str) -> List[Article]:
+        """Extract AI-related repos from the GitHub trending page HTML"""
+        soup = BeautifulSoup(bytes(body), 'lxml')
+        repos = []
+        
+        # Find repo articles
+        for article in soup.find_all('article', class_='Box-row', limit=8):
+            try:
+                # Extract repo name
+                h2 = article.find('h2')
+                if not h2:
+                    continue
+                
+                repo_link = h2.find('a')
+                if not repo_link:
+                    continue
+                
+                repo_name = repo_link.get('href', '').strip('/')
+                
+                # Extract description
+                desc_tag = article.find('p', class_='col-9')
+                description = desc_tag.text.strip() if desc_tag else "No description"
+                
+                # Extract stars
+                stars_tag = article.find('span', class_='d-inline-block float-sm-right')
+                stars = stars_tag.text.strip() if stars_tag else "0"
+                
+                # Only include if AI/ML related (the name alone usually decides)
+                if AI_KEYWORD_RE.search(repo_name) or AI_KEYWORD_RE.search(description):
+                    repo = Article(
+                        title=f"Trending: {repo_name}",
+                        url=f"https://github.com/{repo_name}",
+                        category='Open Source Tool',
+                        source='GitHub',
+                        published=fetched_at,
+                        extra={
+                            'repo_name': repo_name,
+                            'description': description,
+                            'stars_today': stars
+                        }
+                    )
+                    repos.append(repo)
+            
+            except Exception as e:
+                continue
+        
+        return repos
+    
+    async def fetch_reddit_ai(self) -> List[Article]:
         """
         Fetch hot posts from AI subreddits
         Real-time source: Reddit r/MachineLearning, r/artificial, r/LocalLLaMA
@@ -225,41 +701,20 @@ class AIDataRetriever:
         
         try:
             subreddits = ['MachineLearning', 'artificial', 'LocalLLaMA']
-            all_posts = []
             
-            async with aiohttp.ClientSession() as session:
-                for subreddit in subreddits:
-                    try:
-                        url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=5"
-                        headers = {'User-Agent': 'AI News Aggregator 1.0'}
-                        
-                        async with session.get(url, headers=headers, timeout=10) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                
-                                for post in data.get('data', {}).get('children', []):
-                                    post_data = post.get('data', {})
-                                    
-                                    discussion = {
-                                        'title': post_data.get('title', 'No title'),
-                                        'summary': post_data.get('selftext', '')[:200] + "...",
-                                        'upvotes': post_data.get('ups', 0),
-                                        'comments': post_data.get('num_comments', 0),
-                                        'url': f"https://reddit.com{post_data.get('permalink', '')}",
-                                        'subreddit': subreddit,
-                                        'category': 'Community Discussion',
-                                        'source': f'Reddit r/{subreddit}',
-                                        'published': datetime.fromtimestamp(
-                                            post_data.get('created_utc', 0)
-                                        ).isoformat()
-                                    }
-                                    all_posts.append(discussion)
-                    
-                    except Exception as e:
-                        logger.warning(f"  ⚠ Failed to fetch r/{subreddit}: {e}")
-                        continue
+            results = await asyncio.gather(
+                *[self._fetch_subreddit(subreddit) for subreddit in subreddits],
+                return_exceptions=True
+            )
             
-            self.sources_fetched.append('Reddit')
+            all_posts = []
+            for subreddit, result in zip(subreddits, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"  ⚠ Failed to fetch r/{subreddit}: {result}")
+                    continue
+                all_posts.extend(result)
+            
+            self.sources_fetched.add('Reddit')
             logger.info(f"  ✓ Fetched {len(all_posts)} Reddit discussions")
             return all_posts
             
@@ -267,31 +722,54 @@ class AIDataRetriever:
             logger.error(f"  ✗ Reddit fetch failed: {e}")
             return []
     
-    import feedparser
-
-    async def fetch_papers_with_code(self):
+    async def _fetch_subreddit(self, subreddit: str) -> List[Article]:
+        """Fetch hot posts from a single subreddit"""
+        url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=5"
+        
+        return await self._fetch_conditional(
+            url, partial(self._parse_subreddit, subreddit), headers=REDDIT_HEADERS
+        )
+    
+    def _parse_subreddit(self, subreddit: str, body: bytearray) -> List[Article]:
+        """Extract discussions from a subreddit listing"""
+        data = orjson.loads(body)
+        
+        posts = []
+        for post in data.get('data', {}).get('children', []):
+            post_data = post.get('data', {})
+            
+            discussion = Article(
+                title=post_data.get('title', 'No title'),
+                summary=_truncate(post_data.get('selftext') or '', 200),
+                url=f"https://reddit.com{post_data.get('permalink', '')}",
+                category='Community Discussion',
+                source=f'Reddit r/{subreddit}',
+                published=datetime.fromtimestamp(
+                    post_data.get('created_utc', 0)
+                ).isoformat(),
+                extra={
+                    'upvotes': post_data.get('ups', 0),
+                    'comments': post_data.get('num_comments', 0),
+                    'subreddit': subreddit
+                }
+            )
+            posts.append(discussion)
+        
+        return posts
+    
+    async def fetch_papers_with_code(self, fetched_at: Optional[str] = None):
 
         logger.info("Fetching Papers with Code via RSS...")
+        fetched_at = fetched_at or datetime.now().isoformat()
 
         try:
-            feed = feedparser.parse("https://paperswithcode.com/rss/latest")
-
-            papers = []
-
-            for entry in feed.entries[:8]:
-
-                papers.append({
-                    "title": entry.title,
-                    "summary": entry.summary[:300] + "...",
-                    "url": entry.link,
-                    "paper_url": entry.link,
-                    "stars": 0,
-                    "category": "Research with Code",
-                    "source": "Papers with Code",
-                    "published": entry.get("published", datetime.now().isoformat())
-                })
+            url = "https://paperswithcode.com/rss/latest"
+            
+            papers = await self._fetch_conditional(
+                url, partial(self._parse_papers_with_code, fetched_at=fetched_at)
+            )
 
-            self.sources_fetched.append("Papers with Code")
+            self.sources_fetched.add("Papers with Code")
 
             logger.info(f"✓ Fetched {len(papers)} papers via RSS")
 
@@ -301,119 +779,82 @@ class AIDataRetriever:
             logger.error(f"Papers with Code fetch failed: {e}")
             return []
 
+    def _parse_papers_with_code(self, body: bytearray, fetched_at: str) -> List[Article]:
+        """Extract papers from the Papers with Code RSS feed"""
+        papers = []
+
+        for item in _parse_rss_items(body)[:8]:
+            url = _rss_text(item, '{*}link')
+
+            papers.append(Article(
+                title=_rss_text(item, '{*}title'),
+                summary=_truncate(_rss_text(item, '{*}description')),
+                url=url,
+                category="Research with Code",
+                source="Papers with Code",
+                published=_rss_published(item, fetched_at),
+                extra={
+                    "paper_url": url,
+                    "stars": 0
+                }
+            ))
+
+        return papers
+
 
     
-    async def fetch_ai_news_aggregators(self) -> List[Dict[str, Any]]:
+    async def fetch_ai_news_aggregators(self, fetched_at: Optional[str] = None) -> List[Article]:
         """
         Fetch from AI news aggregators and tech news sites
         """
         logger.info(" Fetching AI news from aggregators...")
         
-        articles = []
-        
         # Simulated news with REAL working URLs
-        news_sources = [
-            {
-                'title': 'OpenAI Announces GPT-4.5 with Enhanced Reasoning',
-                'summary': 'OpenAI releases GPT-4.5 with improved mathematical reasoning and coding capabilities, showing 40% improvement in STEM benchmarks.',
-                'url': 'https://openai.com/index/gpt-4',  # Real OpenAI blog URL
-                'source': 'OpenAI Blog',
-                'category': 'Model Release',
-                'published': datetime.now().isoformat()
-            },
-            {
-                'title': 'Google DeepMind Releases Gemini 1.5 Pro',
-                'summary': 'New model features 1M token context window and improved multimodal understanding across text, images, video, and audio.',
-                'url': 'https://deepmind.google/technologies/gemini/',  # Real DeepMind URL
-                'source': 'Google DeepMind',
-                'category': 'Model Release',
-                'published': datetime.now().isoformat()
-            },
-            {
-                'title': 'Meta Open-Sources Llama 3 70B',
-                'summary': 'Meta releases Llama 3 with 70B parameters, rivaling GPT-4 performance while remaining completely open-source and free to use.',
-                'url': 'https://llama.meta.com/',  # Real Meta Llama URL
-                'source': 'Meta AI',
-                'category': 'Open Source Release',
-                'published': datetime.now().isoformat()
-            },
-            {
-                'title': 'Anthropic Claude 3.5 Sonnet Benchmarks',
-                'summary': 'Claude 3.5 Sonnet shows state-of-the-art performance on coding benchmarks, surpassing GPT-4 on several metrics.',
-                'url': 'https://www.anthropic.com/news/claude-3-5-sonnet',  # Real Anthropic URL
-                'source': 'Anthropic',
-                'category': 'Model Release',
-                'published': datetime.now().isoformat()
-            },
-            {
-                'title': 'Stability AI Releases Stable Diffusion 3',
-                'summary': 'Latest image generation model features improved text rendering and better composition understanding.',
-                'url': 'https://stability.ai/news/stable-diffusion-3',  # Real Stability AI URL
-                'source': 'Stability AI',
-                'category': 'Image Generation',
-                'published': datetime.now().isoformat()
-            }
-        ]
-        
-        articles.extend(news_sources)
+        published = fetched_at or datetime.now().isoformat()
+        articles = [Article(**news, published=published) for news in SIMULATED_NEWS]
         
-        self.sources_fetched.append('AI News Aggregators')
+        self.sources_fetched.add('AI News Aggregators')
         logger.info(f"  ✓ Fetched {len(articles)} news articles")
         return articles
 
-    async def fetch_company_blogs(self) -> List[Dict[str, Any]]:
+    async def fetch_company_blogs(self, fetched_at: Optional[str] = None) -> List[Article]:
         """
         Fetch updates from major AI company blogs (OpenAI, Google, Meta, etc.)
         """
         logger.info(" Fetching company blog updates...")
         
         # In production, these would be RSS feeds or APIs
-        updates = [
-            {
-                'title': 'OpenAI API Updates: Function Calling Improvements',
-                'summary': 'Enhanced function calling with parallel execution and improved accuracy in parameter extraction.',
-                'url': 'https://openai.com/index/function-calling-and-other-api-updates',  # Real blog post URL
-                'source': 'OpenAI',
-                'category': 'Tool Update',
-                'published': datetime.now().isoformat()
-            },
-            {
-                'title': 'Hugging Face Launches Inference Endpoints',
-                'summary': 'New managed service for deploying ML models at scale with automatic scaling and optimization.',
-                'url': 'https://huggingface.co/docs/inference-endpoints',  # Correct documentation URL
-                'source': 'Hugging Face',
-                'category': 'Platform Update',
-                'published': datetime.now().isoformat()
-            }
-        ]
+        published = fetched_at or datetime.now().isoformat()
+        updates = [Article(**update, published=published) for update in SIMULATED_COMPANY_UPDATES]
         
-        self.sources_fetched.append('Company Blogs')
+        self.sources_fetched.add('Company Blogs')
         logger.info(f"  ✓ Fetched {len(updates)} company updates")
         return updates
     
-    def get_summary_stats(self, all_data: Dict[str, List]) -> Dict[str, Any]:
+    def get_summary_stats(self, all_data: Dict[str, List[Article]]) -> Dict[str, Any]:
         """
         Get summary statistics of retrieved data
         """
+        all_items = [
+            item
+            for items in all_data.values() if isinstance(items, list)
+            for item in items
+        ]
+        
         stats = {
-            'total_items': sum(len(v) for v in all_data.values() if isinstance(v, list)),
+            'total_items': len(all_items),
             'sources_count': len(self.sources_fetched),
-            'sources_list': self.sources_fetched,
-            'by_category': {},
-            'by_source': {}
+            'sources_list': sorted(self.sources_fetched),
+            # Count by category and source
+            'by_category': dict(Counter(item.category or 'Unknown' for item in all_items)),
+            'by_source': dict(Counter(item.source or 'Unknown' for item in all_items))
         }
         
-        # Count by category and source
-        for source_type, items in all_data.items():
-            if isinstance(items, list):
-                for item in items:
-                    # By category
-                    cat = item.get('category', 'Unknown')
-                    stats['by_category'][cat] = stats['by_category'].get(cat, 0) + 1
-                    
-                    # By source
-                    src = item.get('source', 'Unknown')
-                    stats['by_source'][src] = stats['by_source'].get(src, 0) + 1
+        # Headline counters shown in the report header
+        by_category = stats['by_category']
+        stats['research_count'] = by_category.get('Research Paper', 0) + by_category.get('Research with Code', 0)
+        stats['models_count'] = by_category.get('Model Release', 0)
+        stats['tools_count'] = by_category.get('Open Source Tool', 0) + by_category.get('Tool Update', 0)
         
         return stats
 
@@ -428,7 +869,10 @@ async def demo_data_retrieval():
     retriever = AIDataRetriever()
     
     # Fetch all data
-    all_data = await retriever.fetch_all_sources()
+    try:
+        all_data = await retriever.fetch_all_sources()
+    finally:
+        await retriever.aclose()
     
     # Get stats
     stats = retriever.get_summary_stats(all_data)
@@ -469,4 +913,10 @@ async def demo_data_retrieval():
 
 
 if __name__ == "__main__":
-    asyncio.run(demo_data_retrieval())
+    # uvloop is optional (not available on Windows); fall back to asyncio's loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(demo_data_retrieval())
+    else:
+        uvloop.run(demo_data_retrieval())
@@ -0,0 +1,27 @@
+"""
+Hashing Helpers - Cache Keys
+One content digest shared by the Gemini response cache and the report cache
+"""
+
+import hashlib
+from typing import Union
+
+# BLAKE3 is several times faster than hashlib on prompt-sized inputs;
+# blake2b is the stdlib fallback when the package isn't installed. Both
+# produce 32-byte digests, so keys have the same length either way.
+DIGEST_SIZE = 32
+
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:
+    def _hasher():
+        return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def content_hash(*parts: Union[str, bytes]) -> str:
+    """Hex digest of the given parts, NUL-separated so boundaries can't shift"""
+    digest = _hasher()
+    for part in parts:
+        digest.update(part.encode('utf-8') if isinstance(part, str) else part)
+        digest.update(b'\0')
+    return digest.hexdigest()
@@ -5,110 +5,312 @@ Comprehensive AI analysis and summarization
 
 import asyncio
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncGenerator, Optional, Tuple
 from datetime import datetime
-import json
+import orjson
+from pydantic import BaseModel
+from hashing import content_hash
+import re
 from dotenv import load_dotenv
 import os
+import random
+import sqlite3
+import sys
+import time
+import zlib
 
 #load_dotenv(".env.gemini")
 load_dotenv() 
 
+try:
+    import httpx
+    from google.genai import errors as genai_errors
+    # The SDK's async transport is httpx: timeouts and dropped or refused
+    # connections surface as httpx.TransportError subclasses, not APIError
+    RETRYABLE_GEMINI_ERRORS = (genai_errors.APIError, httpx.TransportError, asyncio.TimeoutError)
+except ImportError:
+    RETRYABLE_GEMINI_ERRORS = (asyncio.TimeoutError,)
+
+# API errors worth another try: rate limiting and transient server failures
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = "gemini-3-flash-preview"
 
-class GeminiProcessor:
+# On-disk cache of Gemini answers; an unchanged prompt within the TTL is
+# served from here instead of calling the API again
+RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ai_updates", "gemini.sqlite3")
+RESPONSE_CACHE_TTL = 24 * 60 * 60
+# Bump when the cached value format changes so stale entries are ignored
+RESPONSE_CACHE_VERSION = "3"
+
+# Per-request HTTP timeout, requests in flight at once, and retry policy
+# for transient Gemini errors
+GEMINI_REQUEST_TIMEOUT_MS = 60_000
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_RETRY_ATTEMPTS = 4
+GEMINI_RETRY_BASE_DELAY = 1.0  # seconds, doubled per attempt
+GEMINI_RETRY_MAX_DELAY = 16.0
+
+# Batch mode sends the consolidated request through Gemini's Batch API:
+# half the price, but results can take minutes to hours. Meant for the
+# unattended daily run; interactive and debug runs stay on the standard tier.
+GEMINI_BATCH_MODE = os.getenv("GEMINI_BATCH_MODE", "false").lower() == "true"
+BATCH_POLL_INITIAL_DELAY = 15.0  # seconds, doubled per poll
+BATCH_POLL_MAX_DELAY = 300.0
+BATCH_TIMEOUT = 4 * 60 * 60
+BATCH_DONE_STATES = frozenset({
+    'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'
+})
+
+# Response schemas for Gemini's structured (JSON mode) output. Field names
+# match what the email report reads. They are pydantic models because
+# google-genai's schema converter rejects typing.TypedDict on Python < 3.12;
+# list-shaped responses are requested as builtin list[Model], since it
+# doesn't accept typing.List[Model] either.
+class KeyDevelopment(BaseModel):
+    rank: int
+    title: str
+    category: str
+    importance: str
+    importance_reason: str
+    impact: str
+    timeframe: str
+    key_takeaway: str
+    source: str
+
+
+class EmergingTrend(BaseModel):
+    trend: str
+    description: str
+    strength: str
+    examples: List[str]
+
+
+class DominantTheme(BaseModel):
+    theme: str
+    prevalence: str
+    significance: str
+
+
+class TechnologicalShifts(BaseModel):
+    description: str
+    old_approach: str
+    new_approach: str
+    implications: str
+
+
+class MarketMovements(BaseModel):
+    active_companies: List[str]
+    hot_sectors: List[str]
+    investment_areas: List[str]
+
+
+class TrendsAnalysis(BaseModel):
+    emerging_trends: List[EmergingTrend]
+    dominant_themes: List[DominantTheme]
+    technological_shifts: TechnologicalShifts
+    market_movements: MarketMovements
+
+
+class Breakthrough(BaseModel):
+    technology: str
+    innovation: str
+    capability: str
+    technical_advancement: str
+    potential_applications: str
+    adoption_timeline: str
+    limitations: str
+
+
+class SectorImpact(BaseModel):
+    sector: str
+    direct_impact: str
+    opportunities: str
+    challenges: str
+    timeline: str
+
+
+class ActionableInsights(BaseModel):
+    ai_practitioners: List[str]
+    business_leaders: List[str]
+    researchers: List[str]
+    investors: List[str]
+    general_public: List[str]
+
+
+class FuturePredictions(BaseModel):
+    next_week: List[str]
+    next_month: List[str]
+    next_quarter: List[str]
+    wild_cards: List[str]
+
+
+class ConsolidatedAnalysis(BaseModel):
+    executive_summary: str
+    key_developments: List[KeyDevelopment]
+    trends_and_patterns: TrendsAnalysis
+    breakthrough_technologies: List[Breakthrough]
+    industry_impact: List[SectorImpact]
+    actionable_insights: ActionableInsights
+    future_predictions: FuturePredictions
+
+
+def _sectors_by_name(entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Re-key a list of SectorImpact entries by sector, the shape the report reads"""
+    return {
+        entry.get('sector', 'Other'): {k: v for k, v in entry.items() if k != 'sector'}
+        for entry in entries
+        if isinstance(entry, dict)
+    }
+
+
+# Title keywords for local importance classification, matched as plain
+# substrings like the original keyword lists ("release" also hits "Releases").
+# Each tier is one compiled alternation, so a title costs one scan in re's C
+# matcher per tier; with this few keywords an Aho-Corasick automaton
+# (pyahocorasick) or a native extension wouldn't earn its dependency.
+CRITICAL_KEYWORD_RE = re.compile(r"breakthrough|release|launches|announces|gpt|gemini", re.IGNORECASE)
+HIGH_KEYWORD_RE = re.compile(r"improves|enhances|new model|open source", re.IGNORECASE)
+
+# Prompt budget for the shared data digest. Tokens are estimated from
+# characters (about 4 per token for English) to avoid a count_tokens
+# round-trip per run.
+MAX_SUMMARY_TOKENS = 8000
+CHARS_PER_TOKEN = 4
+MAX_ITEMS_PER_SOURCE = 15
+
+# Below either threshold the data is too thin to be worth an LLM call
+MIN_ITEMS_FOR_ANALYSIS = 3
+MIN_SUMMARY_CHARS = 500
+NO_DEVELOPMENTS_SUMMARY = (
+    "No significant AI developments were collected today. The sources returned "
+    "too little content for a meaningful analysis."
+)
+
+EXECUTIVE_SUMMARY_FAILED = "Executive summary generation failed. Please check API configuration."
+
+
+def _list_sources(all_data: Dict[str, Any]) -> List[Tuple[str, List]]:
+    """(source_type, items) pairs for the non-empty item lists in all_data"""
+    return [(k, v) for k, v in all_data.items() if isinstance(v, list) and v]
+
+
+def _first_json_value(text: str) -> Optional[str]:
     """
-    Advanced LLM processor using Gemini for comprehensive AI analysis
+    Slice out the first balanced {...} or [...] in text, honoring strings
+    and escapes, or None when there is none
     """
+    start = next((i for i, ch in enumerate(text) if ch in '{['), None)
+    if start is None:
+        return None
     
-    def __init__(self, api_key: str):
-        """
-        Initialize Gemini processor
-        
-        Args:
-            api_key: Gemini API key
-        """
-        self.api_key = api_key
-        
-        try:
-            import google.generativeai as genai
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel("gemini-3-flash-preview")
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
 
-            '''from google import genai
-            client = genai.Client(api_key=self.api_key)
-            self.model = client.models.generate_content(model="gemini-3-flash-preview")'''
 
-            logger.info("✓ Gemini processor initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Gemini: {e}")
-            raise
+def _parse_json(text: str) -> Any:
+    """
+    Decode a model reply as JSON
     
-    async def process_all_data(self, all_data: Dict[str, List[Dict]]) -> Dict[str, Any]:
-        """
-        Comprehensive processing of all collected AI data
-        """
-        logger.info("="*70)
-        logger.info("Starting comprehensive AI analysis with Gemini")
-        logger.info("="*70)
+    JSON mode normally returns bare JSON; if it doesn't (markdown fences,
+    a sentence before the object), fall back to the first balanced value.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        candidate = _first_json_value(text)
+        if candidate is None:
+            logger.error(f"  ✗ No JSON found in response: {text[:200]!r}")
+            raise
+        try:
+            return orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            logger.error(f"  ✗ Unparseable JSON in response: {text[:200]!r}")
+            raise
 
-        ###################################################################################################################
-                                            # Process different aspects in parallel
-        ###################################################################################################################
-        tasks = [
-            self.generate_executive_summary(all_data),
-            self.extract_key_developments(all_data),
-            self.analyze_trends_and_patterns(all_data),
-            self.identify_breakthrough_technologies(all_data),
-            self.assess_industry_impact(all_data),
-            self.generate_actionable_insights(all_data),
-            self.predict_future_directions(all_data),
-            self.categorize_by_importance(all_data),
-        ]
-        
-        results = await asyncio.gather(*tasks)
-        
-        analysis_result = {
-            'timestamp': datetime.now().isoformat(),
-            'executive_summary': results[0],
-            'key_developments': results[1],
-            'trends_and_patterns': results[2],
-            'breakthrough_technologies': results[3],
-            'industry_impact': results[4],
-            'actionable_insights': results[5],
-            'future_predictions': results[6],
-            'prioritization': results[7],
-            'metadata': {
-                'total_sources': sum(len(v) for v in all_data.values() if isinstance(v, list)),
-                'analysis_model': 'Gemini Pro',
-                'processing_time': datetime.now().isoformat()
-            }
-        }
-        
-        logger.info("="*70)
-        logger.info("✓ Comprehensive analysis complete")
-        logger.info("="*70)
-        
-        return analysis_result
-    ####################################### Generate executive summary using Gemini and prompt [MadeUP ->data_summary #####################################
-    ######################################################## First TAsk #######################################################
 
-    async def generate_executive_summary(self, all_data: Dict) -> str:
-        """
-        Generate executive summary of all AI developments
+# Sections produced by the LLM and the JSON type each must parse to
+ANALYSIS_SECTIONS = {
+    'executive_summary': str,
+    'key_developments': list,
+    'trends_and_patterns': dict,
+    'breakthrough_technologies': list,
+    'industry_impact': dict,
+    'actionable_insights': dict,
+    'future_predictions': dict,
+}
+
+# Instructions for the single request that covers every section at once.
+# Key names match what the email report reads.
+CONSOLIDATED_TASK = """
+        You are an AI industry analyst. Analyze today's AI developments above and
+        return ONE JSON object with exactly these keys:
+
+        SECTION_1 "executive_summary": string, 3 paragraphs (OVERVIEW, SIGNIFICANCE,
+          OUTLOOK). Professional, engaging tone; specific numbers and names.
+
+        SECTION_2 "key_developments": array of the TOP 10 most important items, each
+          {"rank": 1, "title": "...", "category": "Model Release / Research / Tool / News / Policy",
+           "importance": "Critical / High / Medium", "importance_reason": "...",
+           "impact": "...", "timeframe": "Immediate / Short-term / Long-term",
+           "key_takeaway": "...", "source": "..."}
+
+        SECTION_3 "trends_and_patterns": object
+          {"emerging_trends": [{"trend": "...", "description": "...", "strength": "...", "examples": ["..."]}],
+           "dominant_themes": [{"theme": "...", "prevalence": "...", "significance": "..."}],
+           "technological_shifts": {"description": "...", "old_approach": "...",
+                                    "new_approach": "...", "implications": "..."},
+           "market_movements": {"active_companies": ["..."], "hot_sectors": ["..."],
+                                "investment_areas": ["..."]}}
+          with 3-5 emerging trends and the top 3 dominant themes.
+
+        SECTION_4 "breakthrough_technologies": array of the top 5 technical breakthroughs,
+          ranked by significance, each {"technology": "...", "innovation": "...",
+          "capability": "...", "technical_advancement": "...",
+          "potential_applications": "...", "adoption_timeline": "...", "limitations": "..."}
+
+        SECTION_5 "industry_impact": array with one entry per relevant sector (Healthcare &
+          Biotech, Finance & Banking, Technology & Software, Manufacturing & Robotics,
+          Education & Research, Creative Industries, Legal & Compliance,
+          Retail & E-commerce), each {"sector": "...", "direct_impact": "...",
+          "opportunities": "...", "challenges": "...", "timeline": "..."}
+
+        SECTION_6 "actionable_insights": object with keys "ai_practitioners",
+          "business_leaders", "researchers", "investors", "general_public", each an
+          array of specific, actionable recommendation strings.
+
+        SECTION_7 "future_predictions": object with keys "next_week", "next_month",
+          "next_quarter", "wild_cards", each an array of prediction strings. Be specific
+          with companies, technologies, and timelines.
+
+        Return ONLY the JSON object.
         """
-        logger.info(" Generating executive summary...")
-        
-        # Prepare data for Gemini
-        data_summary = self._prepare_data_summary(all_data)
-        
-        prompt = f"""
+
+
+# Per-section task instructions, used when the consolidated answer misses a section
+EXECUTIVE_SUMMARY_TASK = """
         You are an AI industry analyst. Analyze today's AI developments and create a compelling executive summary.
         
-        DATA COLLECTED TODAY:
-        {data_summary}
-        
         Create a 3-paragraph executive summary covering:
         
         1. OVERVIEW: What's happening in AI today? Big picture view.
@@ -118,32 +320,10 @@ class GeminiProcessor:
         Write in a professional, engaging tone. Focus on impact and implications.
         Be specific with numbers and names when available.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            summary = response.text
-            logger.info("  ✓ Executive summary generated")
-            return summary
-        except Exception as e:
-            logger.error(f"  ✗ Summary generation failed: {e}")
-            return "Executive summary generation failed. Please check API configuration."
-    ####################################### extract_key_developments using Gemini and prompt ->data_summary#####################################
-    ######################################################## 2 -> TAsk #######################################################
 
-    async def extract_key_developments(self, all_data: Dict) -> List[Dict[str, Any]]:
-        """
-        Extract and rank the most important developments
-        """
-        logger.info(" Extracting key developments...")
-        
-        data_summary = self._prepare_data_summary(all_data)
-        
-        prompt = f"""
+KEY_DEVELOPMENTS_TASK = """
         Analyze these AI developments and identify the TOP 10 MOST IMPORTANT items.
         
-        DATA:
-        {data_summary}
-        
         For each of the top 10, provide:
         - Title: Clear, specific title
         - Category: (Model Release / Research / Tool / News / Policy)
@@ -154,7 +334,7 @@ class GeminiProcessor:
         
         Return as JSON array with exactly these fields:
         [
-          {{
+          {
             "rank": 1,
             "title": "...",
             "category": "...",
@@ -164,45 +344,16 @@ class GeminiProcessor:
             "timeframe": "...",
             "key_takeaway": "...",
             "source": "..."
-          }},
+          },
           ...
         ]
         
         Return ONLY the JSON array, no other text.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            # Extract JSON from response
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0]
-            
-            developments = json.loads(result_text)
-            logger.info(f"  ✓ Extracted {len(developments)} key developments")
-            return developments
-        except Exception as e:
-            logger.error(f"  ✗ Development extraction failed: {e}")
-            return []
-    ####################################### analyze_trends_and_patterns using Gemini and prompt ->data_summary #####################################
-    ######################################################## 3 -> TAsk #######################################################
-    async def analyze_trends_and_patterns(self, all_data: Dict) -> Dict[str, Any]:
-        """
-        Identify emerging trends and patterns in AI
-        """
-        logger.info(" Analyzing trends and patterns...")
-        
-        data_summary = self._prepare_data_summary(all_data)
-        
-        prompt = f"""
+
+TRENDS_TASK = """
         Analyze these AI developments for TRENDS and PATTERNS.
         
-        DATA:
-        {data_summary}
-        
         Identify:
         
         1. EMERGING TRENDS (3-5 trends)
@@ -223,62 +374,34 @@ class GeminiProcessor:
            - What sectors are active?
         
         Return as structured JSON:
-        {{
+        {
           "emerging_trends": [
-            {{"trend": "...", "description": "...", "strength": "...", "examples": ["..."]}},
+            {"trend": "...", "description": "...", "strength": "...", "examples": ["..."]},
             ...
           ],
           "dominant_themes": [
-            {{"theme": "...", "prevalence": "...", "significance": "..."}},
+            {"theme": "...", "prevalence": "...", "significance": "..."},
             ...
           ],
-          "technological_shifts": {{
+          "technological_shifts": {
             "description": "...",
             "old_approach": "...",
             "new_approach": "...",
             "implications": "..."
-          }},
-          "market_movements": {{
+          },
+          "market_movements": {
             "active_companies": ["..."],
             "hot_sectors": ["..."],
             "investment_areas": ["..."]
-          }}
-        }}
+          }
+        }
         
         Return ONLY JSON.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0]
-            
-            trends = json.loads(result_text)
-            logger.info("  ✓ Trend analysis complete")
-            return trends
-        except Exception as e:
-            logger.error(f"  ✗ Trend analysis failed: {e}")
-            return {}
-    ####################################### identify_breakthrough_technologies using Gemini and prompt ->data_summary #####################################
-    ######################################################## 4 -> TAsk #######################################################
-    async def identify_breakthrough_technologies(self, all_data: Dict) -> List[Dict[str, Any]]:
-        """
-        Identify breakthrough technologies and innovations
-        """
-        logger.info(" Identifying breakthrough technologies...")
-        
-        data_summary = self._prepare_data_summary(all_data)
-        
-        prompt = f"""
+
+BREAKTHROUGHS_TASK = """
         Identify BREAKTHROUGH TECHNOLOGIES from today's AI developments.
         
-        DATA:
-        {data_summary}
-        
         Find the top 5 most significant technical breakthroughs or innovations.
         
         For each, provide:
@@ -292,36 +415,10 @@ class GeminiProcessor:
         
         Return as JSON array, ranked by significance.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            
-            breakthroughs = json.loads(result_text)
-            logger.info(f"  ✓ Identified {len(breakthroughs)} breakthroughs")
-            return breakthroughs
-        except Exception as e:
-            logger.error(f"  ✗ Breakthrough identification failed: {e}")
-            return []
-    ####################################### assess_industry_impact using Gemini and prompt ->data_summary #####################################
-    ######################################################## 4 -> TAsk #######################################################
-    async def assess_industry_impact(self, all_data: Dict) -> Dict[str, Any]:
-        """
-        Assess impact on different industries and sectors
-        """
-        logger.info(" Assessing industry impact...")
-        
-        data_summary = self._prepare_data_summary(all_data)
-        
-        prompt = f"""
+
+INDUSTRY_IMPACT_TASK = """
         Assess how today's AI developments impact different industries.
         
-        DATA:
-        {data_summary}
-        
         Analyze impact on these sectors:
         - Healthcare & Biotech
         - Finance & Banking
@@ -340,36 +437,10 @@ class GeminiProcessor:
         
         Return as JSON with sector-specific analysis.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            
-            impact = json.loads(result_text)
-            logger.info("  ✓ Industry impact assessed")
-            return impact
-        except Exception as e:
-            logger.error(f"  ✗ Industry impact assessment failed: {e}")
-            return {}
-    ####################################### generate_actionable_insights using Gemini and prompt ->data_summary #####################################
-    ######################################################## 5 -> TAsk #######################################################
-    async def generate_actionable_insights(self, all_data: Dict) -> Dict[str, List[str]]:
-        """
-        Generate actionable insights for different stakeholders
-        """
-        logger.info(" Generating actionable insights...")
-        
-        data_summary = self._prepare_data_summary(all_data)
-        
-        prompt = f"""
+
+ACTIONABLE_INSIGHTS_TASK = """
         Based on today's AI developments, provide ACTIONABLE INSIGHTS for different stakeholders.
         
-        DATA:
-        {data_summary}
-        
         Provide specific, actionable recommendations for:
         
         1. AI PRACTITIONERS & DEVELOPERS
@@ -399,36 +470,10 @@ class GeminiProcessor:
         
         Return as JSON with clear, specific action items for each group.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            
-            insights = json.loads(result_text)
-            logger.info("  ✓ Actionable insights generated")
-            return insights
-        except Exception as e:
-            logger.error(f"  ✗ Insight generation failed: {e}")
-            return {}
-    ####################################### predict_future_directions using Gemini and prompt ->data_summary #####################################
-    ######################################################## 4 -> TAsk #######################################################
-    async def predict_future_directions(self, all_data: Dict) -> Dict[str, Any]:
-        """
-        Predict future directions based on current developments
-        """
-        logger.info(" Predicting future directions...")
-        
-        data_summary = self._prepare_data_summary(all_data)
-        
-        prompt = f"""
+
+FUTURE_PREDICTIONS_TASK = """
         Based on today's developments, predict FUTURE DIRECTIONS for AI.
         
-        DATA:
-        {data_summary}
-        
         Provide predictions for:
         
         1. NEXT WEEK
@@ -450,15 +495,437 @@ class GeminiProcessor:
         Be specific with companies, technologies, and timelines when possible.
         Return as JSON.
         """
+
+
+class _ResponseCache:
+    """
+    Gemini answers in one SQLite table (WAL mode), zlib-compressed JSON,
+    expired by age; expired rows are purged when the database is opened
+    """
+    
+    def __init__(self, path: str, ttl: float = RESPONSE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response BLOB NOT NULL, created_at INTEGER NOT NULL)"
+            )
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (int(time.time() - self.ttl),))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None when missing, expired or unreadable"""
+        try:
+            row = self._connect().execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (key, int(time.time() - self.ttl))
+            ).fetchone()
+            return orjson.loads(zlib.decompress(row[0])) if row else None
+        except Exception as e:
+            logger.warning(f"  ⚠ Ignoring unreadable cache entry {key}: {e}")
+            return None
+    
+    def set(self, key: str, value: Any):
+        """Store a value; failures are logged and otherwise ignored"""
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, zlib.compress(orjson.dumps(value)), int(time.time()))
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"  ⚠ Could not write cache entry {key}: {e}")
+    
+    def close(self):
+        """Close the database connection; the next access reopens it"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class GeminiProcessor:
+    """
+    Advanced LLM processor using Gemini for comprehensive AI analysis
+    """
+    
+    def __init__(
+        self,
+        api_key: str,
+        cache_path: Optional[str] = RESPONSE_CACHE_PATH,
+        max_summary_tokens: int = MAX_SUMMARY_TOKENS,
+        model_name: str = MODEL_NAME,
+        batch_mode: bool = GEMINI_BATCH_MODE
+    ):
+        """
+        Initialize Gemini processor
+        
+        Args:
+            api_key: Gemini API key
+            cache_path: SQLite file caching Gemini answers (None disables caching)
+            max_summary_tokens: Approximate token budget for the data digest
+            model_name: Gemini model to query
+            batch_mode: Send the consolidated request through the Batch API
+        """
+        self.api_key = api_key
+        self.model_name = model_name
+        self.batch_mode = batch_mode
+        self.max_summary_tokens = max_summary_tokens
+        self.cache = _ResponseCache(cache_path) if cache_path else None
+        self._semaphore: Optional[asyncio.Semaphore] = None  # see _get_semaphore
         
         try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
+            from google import genai
+            from google.genai import types
+            # An instance-scoped client: no process-global configure(), and
+            # its HTTP transport (one connection pool reused by every
+            # concurrent task request) and timeout belong to this processor
+            self.client = genai.Client(
+                api_key=self.api_key,
+                http_options=types.HttpOptions(timeout=GEMINI_REQUEST_TIMEOUT_MS)
+            )
+
+            logger.info("✓ Gemini processor initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize Gemini: {e}")
+            raise
+    
+    async def warmup(self) -> bool:
+        """
+        Open the API connection ahead of the first real request
+        
+        A model metadata lookup pays the DNS and TLS setup in the client's
+        connection pool without spending generation quota. Failures are
+        only logged; the first real request will surface them properly.
+        """
+        try:
+            await self.client.aio.models.get(model=self.model_name)
+            return True
+        except Exception as e:
+            logger.warning(f"Gemini warm-up failed: {e}")
+            return False
+    
+    async def aclose(self):
+        """Close the response cache database"""
+        if self.cache is not None:
+            self.cache.close()
+    
+    async def process_all_data(self, all_data: Dict[str, List[Dict]]) -> Dict[str, Any]:
+        """
+        Comprehensive processing of all collected AI data
+        """
+        logger.info("="*70)
+        logger.info("Starting comprehensive AI analysis with Gemini")
+        logger.info("="*70)
+
+        ###################################################################################################################
+                                            # Process different aspects in parallel
+        ###################################################################################################################
+        # Every prompt embeds the same data digest; build it once
+        data_summary = self._prepare_data_summary(all_data)
+        total_items = sum(len(v) for v in all_data.values() if isinstance(v, list))
+        
+        # Stage 1: keyword prioritization is local and cheap, so it runs
+        # first and narrows what the section prompts need to see
+        prioritization = await self.categorize_by_importance(all_data)
+        
+        if total_items < MIN_ITEMS_FOR_ANALYSIS or len(data_summary) < MIN_SUMMARY_CHARS:
+            logger.warning(f"  ⚠ Skipping Gemini: only {total_items} items "
+                           f"({len(data_summary)} chars) collected")
+            combined = self._empty_sections()
+        else:
+            focused_summary = self._prepare_focused_summary(prioritization, data_summary)
             
-            predictions = json.loads(result_text)
+            # The LLM sections depend only on the digests, so unchanged data (a
+            # repeated run, a test loop) reuses the earlier analysis outright
+            analysis_key = self._cache_key('analysis', f"{data_summary}\0{focused_summary}")
+            cached = self.cache.get(analysis_key) if self.cache else None
+            if isinstance(cached, dict) and self._complete_sections(cached):
+                logger.info("  ✓ Reusing cached analysis for unchanged data")
+                combined = cached
+            else:
+                # Stage 2: LLM sections
+                combined = await self._analyze_sections(all_data, data_summary, focused_summary)
+                # Only a full answer is kept, so a failed section is retried next run
+                if self.cache and self._complete_sections(combined):
+                    self.cache.set(analysis_key, combined)
+        
+        analysis_result = {
+            'timestamp': datetime.now().isoformat(),
+            'executive_summary': combined['executive_summary'],
+            'key_developments': combined['key_developments'],
+            'trends_and_patterns': combined['trends_and_patterns'],
+            'breakthrough_technologies': combined['breakthrough_technologies'],
+            'industry_impact': combined['industry_impact'],
+            'actionable_insights': combined['actionable_insights'],
+            'future_predictions': combined['future_predictions'],
+            'prioritization': prioritization,
+            'metadata': {
+                'total_sources': total_items,
+                'analysis_model': 'Gemini Pro',
+                'processing_time': datetime.now().isoformat()
+            }
+        }
+        
+        logger.info("="*70)
+        logger.info("✓ Comprehensive analysis complete")
+        logger.info("="*70)
+        
+        return analysis_result
+    
+    async def _analyze_sections(
+        self,
+        all_data: Dict,
+        data_summary: str,
+        focused_summary: str
+    ) -> Dict[str, Any]:
+        """
+        Produce every LLM section
+        
+        The consolidated request also writes the executive summary, so it
+        sees the full digest. Per-section fallbacks other than the summary
+        only get the critical/high slice.
+        """
+        combined = await self.analyze_all_in_one(data_summary)
+        
+        # Re-run only the sections the combined answer missed or malformed
+        fallbacks = {
+            'executive_summary': self.generate_executive_summary,
+            'key_developments': self.extract_key_developments,
+            'trends_and_patterns': self.analyze_trends_and_patterns,
+            'breakthrough_technologies': self.identify_breakthrough_technologies,
+            'industry_impact': self.assess_industry_impact,
+            'actionable_insights': self.generate_actionable_insights,
+            'future_predictions': self.predict_future_directions,
+        }
+        missing = [
+            key for key, expected in ANALYSIS_SECTIONS.items()
+            if not isinstance(combined.get(key), expected)
+        ]
+        if missing:
+            logger.warning(f"  ⚠ Falling back to per-section prompts for: {', '.join(missing)}")
+            retried = await asyncio.gather(
+                *[
+                    fallbacks[key](all_data, data_summary if key == 'executive_summary' else focused_summary)
+                    for key in missing
+                ]
+            )
+            combined.update(zip(missing, retried))
+        
+        return combined
+    
+    def _prepare_focused_summary(self, prioritization: Dict[str, List], data_summary: str) -> str:
+        """
+        Digest of only the critical and high items, or the full digest when
+        that slice is too thin to analyze on its own
+        """
+        focused = {'critical': prioritization['critical'], 'high': prioritization['high']}
+        if len(focused['critical']) + len(focused['high']) < MIN_ITEMS_FOR_ANALYSIS:
+            return data_summary
+        return self._prepare_data_summary(focused)
+    
+    @staticmethod
+    def _empty_sections() -> Dict[str, Any]:
+        """Deterministic 'nothing to report' stand-in for every LLM section"""
+        return {
+            key: NO_DEVELOPMENTS_SUMMARY if expected is str else expected()
+            for key, expected in ANALYSIS_SECTIONS.items()
+        }
+    
+    @staticmethod
+    def _complete_sections(combined: Dict[str, Any]) -> bool:
+        """True when every LLM section is present, well-typed and non-empty"""
+        return all(
+            isinstance(combined.get(key), expected) and combined[key]
+            for key, expected in ANALYSIS_SECTIONS.items()
+        ) and combined['executive_summary'] != EXECUTIVE_SUMMARY_FAILED
+    
+    async def analyze_all_in_one(self, data_summary: str) -> Dict[str, Any]:
+        """
+        Run every LLM analysis section in a single Gemini request
+        
+        Returns whatever sections parsed; process_all_data re-runs the
+        individual task for any section that is missing or malformed.
+        """
+        logger.info(" Running consolidated analysis...")
+        
+        prompt = self._build_prompt(data_summary, CONSOLIDATED_TASK)
+        
+        try:
+            combined = await self._generate_json(prompt, ConsolidatedAnalysis, batch=self.batch_mode)
+            if not isinstance(combined, dict):
+                raise ValueError(f"expected a JSON object, got {type(combined).__name__}")
+            if isinstance(combined.get('industry_impact'), list):
+                combined['industry_impact'] = _sectors_by_name(combined['industry_impact'])
+            logger.info("  ✓ Consolidated analysis complete")
+            return combined
+        except Exception as e:
+            logger.error(f"  ✗ Consolidated analysis failed: {e}")
+            return {}
+    
+    ####################################### Generate executive summary using Gemini and prompt [MadeUP ->data_summary #####################################
+    ######################################################## First TAsk #######################################################
+
+    async def generate_executive_summary(self, all_data: Dict, data_summary: Optional[str] = None) -> str:
+        """
+        Generate executive summary of all AI developments
+        """
+        logger.info(" Generating executive summary...")
+        
+        # Prepare data for Gemini (process_all_data passes it in pre-built)
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, EXECUTIVE_SUMMARY_TASK)
+        
+        try:
+            summary = await self._generate_text(prompt)
+            logger.info("  ✓ Executive summary generated")
+            return summary
+        except Exception as e:
+            logger.error(f"  ✗ Summary generation failed: {e}")
+            return EXECUTIVE_SUMMARY_FAILED
+    
+    def stream_executive_summary(self, all_data: Dict, data_summary: Optional[str] = None) -> AsyncGenerator[str, None]:
+        """
+        Stream the executive summary as Gemini generates it
+        
+        Returns an async generator of text chunks so a consumer can start
+        rendering before the reply is complete. Errors reach the consumer;
+        nothing is retried once output has started. The stream holds one
+        GEMINI_MAX_CONCURRENCY slot until it is exhausted or closed, so a
+        consumer that may stop early must await its aclose().
+        """
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, EXECUTIVE_SUMMARY_TASK)
+        return self._stream_text(prompt)
+    ####################################### extract_key_developments using Gemini and prompt ->data_summary#####################################
+    ######################################################## 2 -> TAsk #######################################################
+
+    async def extract_key_developments(self, all_data: Dict, data_summary: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Extract and rank the most important developments
+        """
+        logger.info(" Extracting key developments...")
+        
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, KEY_DEVELOPMENTS_TASK)
+        
+        try:
+            developments = await self._generate_json(prompt, list[KeyDevelopment])
+            logger.info(f"  ✓ Extracted {len(developments)} key developments")
+            return developments
+        except Exception as e:
+            logger.error(f"  ✗ Development extraction failed: {e}")
+            return []
+    ####################################### analyze_trends_and_patterns using Gemini and prompt ->data_summary #####################################
+    ######################################################## 3 -> TAsk #######################################################
+    async def analyze_trends_and_patterns(self, all_data: Dict, data_summary: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Identify emerging trends and patterns in AI
+        """
+        logger.info(" Analyzing trends and patterns...")
+        
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, TRENDS_TASK)
+        
+        try:
+            trends = await self._generate_json(prompt, TrendsAnalysis)
+            logger.info("  ✓ Trend analysis complete")
+            return trends
+        except Exception as e:
+            logger.error(f"  ✗ Trend analysis failed: {e}")
+            return {}
+    ####################################### identify_breakthrough_technologies using Gemini and prompt ->data_summary #####################################
+    ######################################################## 4 -> TAsk #######################################################
+    async def identify_breakthrough_technologies(self, all_data: Dict, data_summary: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Identify breakthrough technologies and innovations
+        """
+        logger.info(" Identifying breakthrough technologies...")
+        
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, BREAKTHROUGHS_TASK)
+        
+        try:
+            breakthroughs = await self._generate_json(prompt, list[Breakthrough])
+            logger.info(f"  ✓ Identified {len(breakthroughs)} breakthroughs")
+            return breakthroughs
+        except Exception as e:
+            logger.error(f"  ✗ Breakthrough identification failed: {e}")
+            return []
+    ####################################### assess_industry_impact using Gemini and prompt ->data_summary #####################################
+    ######################################################## 4 -> TAsk #######################################################
+    async def assess_industry_impact(self, all_data: Dict, data_summary: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Assess impact on different industries and sectors
+        """
+        logger.info(" Assessing industry impact...")
+        
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, INDUSTRY_IMPACT_TASK)
+        
+        try:
+            impact = _sectors_by_name(await self._generate_json(prompt, list[SectorImpact]))
+            logger.info("  ✓ Industry impact assessed")
+            return impact
+        except Exception as e:
+            logger.error(f"  ✗ Industry impact assessment failed: {e}")
+            return {}
+    ####################################### generate_actionable_insights using Gemini and prompt ->data_summary #####################################
+    ######################################################## 5 -> TAsk #######################################################
+    async def generate_actionable_insights(self, all_data: Dict, data_summary: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Generate actionable insights for different stakeholders
+        """
+        logger.info(" Generating actionable insights...")
+        
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, ACTIONABLE_INSIGHTS_TASK)
+        
+        try:
+            insights = await self._generate_json(prompt, ActionableInsights)
+            logger.info("  ✓ Actionable insights generated")
+            return insights
+        except Exception as e:
+            logger.error(f"  ✗ Insight generation failed: {e}")
+            return {}
+    ####################################### predict_future_directions using Gemini and prompt ->data_summary #####################################
+    ######################################################## 4 -> TAsk #######################################################
+    async def predict_future_directions(self, all_data: Dict, data_summary: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Predict future directions based on current developments
+        """
+        logger.info(" Predicting future directions...")
+        
+        if data_summary is None:
+            data_summary = self._prepare_data_summary(all_data)
+        
+        prompt = self._build_prompt(data_summary, FUTURE_PREDICTIONS_TASK)
+        
+        try:
+            predictions = await self._generate_json(prompt, FuturePredictions)
             logger.info("  ✓ Future predictions generated")
             return predictions
         except Exception as e:
@@ -480,49 +947,256 @@ class GeminiProcessor:
             'low': []
         }
         
-        # Keywords for importance classification
-        critical_keywords = ['breakthrough', 'release', 'launches', 'announces', 'gpt', 'gemini']
-        high_keywords = ['improves', 'enhances', 'new model', 'open source']
-        
-        for source_type, items in all_data.items():
-            if not isinstance(items, list):
-                continue
+        critical_search = CRITICAL_KEYWORD_RE.search
+        high_search = HIGH_KEYWORD_RE.search
+        add_critical = categorized['critical'].append
+        add_high = categorized['high'].append
+        
+        for source_type, items in _list_sources(all_data):
+            source_lower = source_type.lower()
+            # Items matching no keyword fall to medium for research sources
+            add_other = (
+                categorized['medium'].append
+                if 'research' in source_lower or 'paper' in source_lower
+                else categorized['low'].append
+            )
             
             for item in items:
-                title_lower = item.get('title', '').lower()
+                title = item.get('title') or ''
                 
-                if any(kw in title_lower for kw in critical_keywords):
-                    categorized['critical'].append(item)
-                elif any(kw in title_lower for kw in high_keywords):
-                    categorized['high'].append(item)
-                elif 'research' in source_type.lower() or 'paper' in source_type.lower():
-                    categorized['medium'].append(item)
+                if critical_search(title):
+                    add_critical(item)
+                elif high_search(title):
+                    add_high(item)
                 else:
-                    categorized['low'].append(item)
+                    add_other(item)
         
         logger.info(f"  ✓ Items categorized: {len(categorized['critical'])} critical, "
                    f"{len(categorized['high'])} high, {len(categorized['medium'])} medium")
         
         return categorized
     
-    def _prepare_data_summary(self, all_data: Dict) -> str:
+    def _get_semaphore(self) -> asyncio.Semaphore:
         """
-        Prepare concise data summary for Gemini prompts
+        Return the request semaphore, creating it inside the running loop
+        
+        On Python 3.9 a semaphore binds to the loop current at construction,
+        and __init__ usually runs before asyncio.run starts the real one.
         """
-        summary_parts = []
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        return self._semaphore
+    
+    async def _call(self, prompt: str, **kwargs) -> Any:
+        """
+        Send one request to Gemini
         
-        for source_type, items in all_data.items():
-            if not isinstance(items, list) or not items:
-                continue
+        Concurrent requests share a semaphore. Rate-limit and transient
+        server errors are retried with jittered exponential backoff, so one
+        429 doesn't silently empty a whole section.
+        """
+        for attempt in range(GEMINI_RETRY_ATTEMPTS):
+            try:
+                async with self._get_semaphore():
+                    response = await self.client.aio.models.generate_content(
+                        model=self.model_name,
+                        contents=prompt,
+                        **kwargs
+                    )
+                # Prompts lead with the shared data block, so Gemini's implicit
+                # context cache can serve that prefix; log when it does
+                usage = getattr(response, 'usage_metadata', None)
+                cached_tokens = getattr(usage, 'cached_content_token_count', None)
+                if cached_tokens:
+                    logger.info(
+                        f"  ↺ {cached_tokens}/{usage.prompt_token_count} prompt tokens "
+                        "served from Gemini's context cache"
+                    )
+                return response
+            except RETRYABLE_GEMINI_ERRORS as e:
+                code = getattr(e, 'code', None)
+                if code is not None and code not in RETRYABLE_STATUS_CODES:
+                    raise
+                if attempt == GEMINI_RETRY_ATTEMPTS - 1:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
             
-            summary_parts.append(f"\n{source_type.upper().replace('_', ' ')}:")
-            for i, item in enumerate(items[:15], 1):  # Limit to 15 per source
-                title = item.get('title', 'Unknown')
-                source = item.get('source', 'Unknown')
-                summary = item.get('summary', item.get('description', ''))[:150]
-                summary_parts.append(f"{i}. {title} [{source}]")
+            # Back off outside the semaphore so waiting retries don't hold a slot
+            delay = min(GEMINI_RETRY_MAX_DELAY, GEMINI_RETRY_BASE_DELAY * 2 ** attempt) * (0.5 + random.random())
+            logger.warning(f"  ⚠ Gemini {reason}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+    
+    async def _call_batch(self, prompt: str, config: Dict[str, Any]) -> Any:
+        """
+        Send one request as a Gemini Batch API job and wait for its result
+        
+        Polls with exponential backoff up to BATCH_TIMEOUT, then cancels
+        the job and raises.
+        """
+        job = await self.client.aio.batches.create(
+            model=self.model_name,
+            src=[{
+                'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+                'config': config,
+            }],
+            config={'display_name': f"ai-updates-{datetime.now():%Y%m%d-%H%M%S}"},
+        )
+        logger.info(f"  ↻ Submitted batch job {job.name}")
+        
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        delay = BATCH_POLL_INITIAL_DELAY
+        while job.state.name not in BATCH_DONE_STATES:
+            if time.monotonic() + delay > deadline:
+                try:
+                    await self.client.aio.batches.cancel(name=job.name)
+                except Exception as e:
+                    logger.warning(f"  ⚠ Could not cancel batch job {job.name}: {e}")
+                raise asyncio.TimeoutError(f"batch job {job.name} still {job.state.name} after {BATCH_TIMEOUT}s")
+            await asyncio.sleep(delay)
+            delay = min(BATCH_POLL_MAX_DELAY, delay * 2)
+            job = await self.client.aio.batches.get(name=job.name)
+        
+        if job.state.name != 'JOB_STATE_SUCCEEDED':
+            raise RuntimeError(f"batch job {job.name} ended in {job.state.name}")
+        
+        inlined = job.dest.inlined_responses[0]
+        if inlined.error:
+            raise RuntimeError(f"batch job {job.name} request failed: {inlined.error}")
+        logger.info(f"  ✓ Batch job {job.name} complete")
+        return inlined.response
+    
+    def _cache_key(self, kind: str, text: str) -> str:
+        """Content hash identifying one request to this model"""
+        return content_hash(RESPONSE_CACHE_VERSION, self.model_name, kind, text)
+    
+    async def _generate_text(self, prompt: str) -> str:
+        """
+        Request free-form text, served from the response cache when possible
+        """
+        key = self._cache_key('text', prompt)
+        cached = self.cache.get(key) if self.cache else None
+        if isinstance(cached, str):
+            return cached
+        
+        response = await self._call(prompt)
+        text = response.text
+        # An empty reply is not cached, so the next run asks again
+        if self.cache and text:
+            self.cache.set(key, text)
+        return text
+    
+    async def _stream_text(self, prompt: str) -> AsyncGenerator[str, None]:
+        """
+        Stream free-form text; a non-empty reply is cached like
+        _generate_text's, and a cached reply is yielded in one piece
+        
+        Chunks are yielded while the concurrency slot is held, so the slot
+        is released only when the generator finishes or is closed.
+        """
+        key = self._cache_key('text', prompt)
+        cached = self.cache.get(key) if self.cache else None
+        if isinstance(cached, str):
+            yield cached
+            return
+        
+        parts = []
+        async with self._get_semaphore():
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+        
+        text = "".join(parts)
+        if self.cache and text:
+            self.cache.set(key, text)
+    
+    async def _generate_json(self, prompt: str, schema: Any, batch: bool = False) -> Any:
+        """
+        Request structured output and decode it
+        
+        Gemini's JSON mode constrains the reply to the given schema, so the
+        text is normally bare JSON; _parse_json copes when it isn't.
+        Non-empty decoded answers are cached per prompt, so after a failure
+        only that request re-runs. With batch=True the request goes through the Batch
+        API, falling back to the standard tier if the job doesn't succeed.
+        """
+        key = self._cache_key(f"json:{schema!r}", prompt)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            return cached
+        
+        config = {
+            "response_mime_type": "application/json",
+            "response_schema": schema,
+        }
+        if batch:
+            try:
+                response = await self._call_batch(prompt, config)
+            except Exception as e:
+                logger.warning(f"  ⚠ Batch request failed ({e}), retrying on the standard tier")
+                response = await self._call(prompt, config=config)
+        else:
+            response = await self._call(prompt, config=config)
+        result = _parse_json(response.text)
+        # Empty sections ([] / {}) are not cached, so the next run asks again
+        if self.cache and result:
+            self.cache.set(key, result)
+        return result
+    
+    @staticmethod
+    def _build_prompt(data_summary: str, task: str) -> str:
+        """
+        Assemble a task prompt with the shared data block first
+        
+        Every task sends the same data, so leading with it gives all prompts
+        an identical prefix that Gemini's implicit context cache can reuse.
+        """
+        return f"DATA COLLECTED TODAY:\n{data_summary}\n\n---\nTASK:\n{task}"
+    
+    def _prepare_data_summary(self, all_data: Dict) -> str:
+        """
+        Prepare concise data summary for Gemini prompts
+        
+        Takes up to MAX_ITEMS_PER_SOURCE items per source, then trims the
+        last items of each source in round-robin until the digest fits the
+        token budget, always keeping at least one item per source.
+        """
+        sections = []
+        
+        for source_type, items in _list_sources(all_data):
+            entries = []
+            append = entries.append
+            for i, item in enumerate(items[:MAX_ITEMS_PER_SOURCE], 1):
+                get = item.get
+                title = get('title') or ''
+                source = get('source')
+                summary = (get('summary') or get('description') or '')[:150]
+                # Missing fields are left out rather than padded with placeholders
+                entry = f"{i}. {title} [{source}]" if source else f"{i}. {title}"
                 if summary:
-                    summary_parts.append(f"   {summary}...")
+                    entry += f"\n   {summary}..."
+                append(entry)
+            sections.append((f"\n{source_type.upper().replace('_', ' ')}:", entries))
+        
+        budget = self.max_summary_tokens * CHARS_PER_TOKEN
+        size = sum(len(header) + 1 + sum(len(e) + 1 for e in entries) for header, entries in sections)
+        while size > budget:
+            trimmed = False
+            for _, entries in sections:
+                if len(entries) > 1 and size > budget:
+                    size -= len(entries.pop()) + 1
+                    trimmed = True
+            if not trimmed:
+                break
+        
+        summary_parts = []
+        for header, entries in sections:
+            summary_parts.append(header)
+            summary_parts.extend(entries)
         
         return "\n".join(summary_parts)
 
@@ -555,8 +1229,8 @@ async def demo_gemini_processing():
     processor = GeminiProcessor(api_key=api_key)
     results = await processor.process_all_data(sample_data)
     
-    print("Results:")
-    print(json.dumps(results, indent=2, default=str))
+    print("Results:", flush=True)
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str) + b"\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+import importlib
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def main_orchestrator(tmp_path_factory):
+    """
+    The orchestrator module, imported from a scratch directory
+    
+    Importing it opens the day's log file in the working directory.
+    """
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('logs'))
+    try:
+        return importlib.import_module('main_orchestrator')
+    finally:
+        os.chdir(cwd)
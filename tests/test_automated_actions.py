@@ -0,0 +1,101 @@
+"""Offline tests for automated_actions_enhanced's report rendering"""
+
+from datetime import datetime
+
+import pytest
+
+from automated_actions_enhanced import EnhancedEmailReporter
+
+ANALYSIS = {
+    'executive_summary': 'Summary',
+    'key_developments': [{'title': 'Model launch', 'importance': 'High'}],
+}
+STATS = {'total_items': 3, 'sources_count': 2}
+
+
+@pytest.fixture
+def reporter():
+    return EnhancedEmailReporter(email_config={
+        'smtp_server': 'smtp.example.com',
+        'smtp_port': 587,
+        'username': 'user',
+        'password': 'secret',
+        'from_email': 'from@example.com',
+        'to_email': 'to@example.com',
+    })
+
+
+def test_cached_render_uses_each_sends_timestamp(reporter):
+    first = datetime(2026, 1, 5, 8, 30, 15)
+    second = datetime(2026, 1, 6, 9, 45, 30)
+    
+    first_html = reporter._create_html_email(ANALYSIS, {}, STATS, first)
+    second_html = reporter._create_html_email(ANALYSIS, {}, STATS, second)
+    
+    assert 'January 05, 2026' in first_html and '2026-01-05 08:30:15' in first_html
+    assert 'January 06, 2026' in second_html and '2026-01-06 09:45:30' in second_html
+    assert 'January 05, 2026' not in second_html
+    # Same inputs and timestamp: served from the cache
+    assert reporter._create_html_email(ANALYSIS, {}, STATS, first) is first_html
+
+
+class FakeSMTP:
+    """Stands in for a connected aiosmtplib.SMTP session; rejects the given addresses once"""
+    
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.sent = []
+    
+    async def noop(self):
+        pass
+    
+    async def send_message(self, msg):
+        if msg['To'] in self.reject:
+            self.reject.discard(msg['To'])
+            raise RuntimeError(f"{msg['To']} rejected")
+        self.sent.append(msg['To'])
+    
+    async def quit(self):
+        pass
+
+
+@pytest.fixture
+def smtp(reporter, monkeypatch):
+    """One FakeSMTP session, handed out again on every reconnect"""
+    server = FakeSMTP()
+    
+    async def get_smtp():
+        reporter._smtp = server
+        return server
+    
+    monkeypatch.setattr(reporter, '_get_smtp', get_smtp)
+    return server
+
+
+RECIPIENTS = ['a@example.com', 'b@example.com', 'c@example.com']
+
+
+async def test_partial_delivery_is_reported_and_retried_without_duplicates(reporter, smtp, monkeypatch):
+    renders = []
+    render = reporter._render_html_email
+    monkeypatch.setattr(reporter, '_render_html_email',
+                        lambda *args: renders.append(args) or render(*args))
+    smtp.reject = {'b@example.com'}
+    now = datetime(2026, 1, 5, 8, 30, 15)
+    
+    assert not await reporter.send_daily_report(ANALYSIS, {}, STATS, RECIPIENTS, now=now)
+    assert reporter.last_delivery['delivered'] == ['a@example.com', 'c@example.com']
+    assert reporter.last_delivery['failed'] == ['b@example.com']
+    
+    # The retry reuses the render and only reaches the recipient that missed it
+    assert await reporter.send_daily_report(ANALYSIS, {}, STATS, RECIPIENTS, now=now)
+    assert reporter.last_delivery['skipped'] == ['a@example.com', 'c@example.com']
+    assert smtp.sent == ['a@example.com', 'c@example.com', 'b@example.com']
+    assert len(renders) == 1
+
+
+async def test_a_new_report_goes_to_everyone_again(reporter, smtp):
+    assert await reporter.send_daily_report(ANALYSIS, {}, STATS, RECIPIENTS, now=datetime(2026, 1, 5))
+    assert await reporter.send_daily_report(ANALYSIS, {}, STATS, RECIPIENTS, now=datetime(2026, 1, 6))
+    
+    assert smtp.sent == RECIPIENTS * 2
@@ -0,0 +1,216 @@
+"""Offline tests for data_retrieval_enhanced, against a fake HTTP session"""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+import data_retrieval_enhanced as retrieval
+
+FEED_URL = 'https://feeds.example.com/rss'
+
+
+class FakeContent:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+    
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error is not None:
+            raise self.error
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=b'', headers=None, content_length=None, error=None):
+        self.status = status
+        self.headers = headers or {}
+        self.content_length = content_length
+        self.content = FakeContent([body] if body else [], error)
+        self.url = FEED_URL
+        self.request_info = None
+        self.history = ()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Answers each GET with the next queued response (or raises it)"""
+    closed = False
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+    
+    def get(self, url, headers=None):
+        self.requests.append((url, dict(headers or {})))
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+
+@pytest.fixture
+def retriever():
+    return retrieval.AIDataRetriever(cache_path=None)
+
+
+def half_open(retriever, host='feeds.example.com'):
+    breaker = retriever._breakers[host]
+    breaker.state = 'open'
+    breaker.opened_at = time.monotonic() - retrieval.BREAKER_COOLDOWN
+    return breaker
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse(content_length=retrieval.MAX_BODY_BYTES + 1),
+    FakeResponse(body=b'<rss>', error=aiohttp.ClientPayloadError('truncated body')),
+])
+async def test_failed_half_open_probe_reopens_the_circuit(retriever, response):
+    breaker = half_open(retriever)
+    retriever._session = FakeSession(response)
+    
+    with pytest.raises((ValueError, aiohttp.ClientPayloadError)):
+        await retriever._get_with_retry(FEED_URL, {})
+    
+    assert breaker.state == 'open'
+    assert not breaker.allow()  # cooling down again, not stuck half-open
+
+
+async def test_cancelled_half_open_probe_admits_the_next_one(retriever):
+    breaker = half_open(retriever)
+    retriever._session = FakeSession(asyncio.CancelledError())
+    
+    with pytest.raises(asyncio.CancelledError):
+        await retriever._get_with_retry(FEED_URL, {})
+    
+    assert breaker.allow()
+    assert breaker.state == 'half_open'
+
+
+@pytest.fixture
+def recorded_sleeps(monkeypatch):
+    delays = []
+    
+    async def sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr(retrieval.asyncio, 'sleep', sleep)
+    return delays
+
+
+async def test_server_errors_are_retried_with_jittered_backoff(retriever, recorded_sleeps):
+    retriever._session = FakeSession(
+        FakeResponse(status=503),
+        FakeResponse(status=502),
+        FakeResponse(body=b'<rss/>', headers={'ETag': '"v1"'}),
+    )
+    
+    body, etag, last_modified = await retriever._get_with_retry(FEED_URL, {})
+    
+    assert (bytes(body), etag, last_modified) == (b'<rss/>', '"v1"', None)
+    assert len(recorded_sleeps) == 2
+    for attempt, delay in enumerate(recorded_sleeps):
+        nominal = retrieval.RETRY_BASE_DELAY * 2 ** attempt
+        assert 0.5 * nominal <= delay <= 1.5 * nominal
+    assert retriever._breakers['feeds.example.com'].state == 'closed'
+
+
+async def test_client_errors_fail_without_retry(retriever, recorded_sleeps):
+    retriever._session = FakeSession(FakeResponse(status=404, body=b'not found'))
+    
+    with pytest.raises(aiohttp.ClientResponseError):
+        await retriever._get_with_retry(FEED_URL, {})
+    
+    assert len(retriever._session.requests) == 1
+    assert not recorded_sleeps
+    # The host answered, so it doesn't count against the breaker
+    assert retriever._breakers['feeds.example.com'].failure_count == 0
+
+
+def test_circuit_breaker_opens_cools_down_and_closes(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(retrieval.time, 'monotonic', lambda: clock[0])
+    breaker = retrieval._CircuitBreaker()
+    
+    for _ in range(retrieval.BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.state == 'closed' and breaker.allow()
+    
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+    
+    clock[0] += retrieval.BREAKER_COOLDOWN
+    assert breaker.allow()
+    assert breaker.state == 'half_open'
+    assert not breaker.allow()  # one probe at a time
+    
+    breaker.record_failure()  # a failed probe re-opens immediately
+    assert breaker.state == 'open' and not breaker.allow()
+    
+    clock[0] += retrieval.BREAKER_COOLDOWN
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.failure_count == 0
+
+
+async def test_unchanged_feed_is_served_from_the_conditional_cache(tmp_path):
+    path = tmp_path / 'fetch_cache.json'
+    parsed = []
+    
+    def parse(body):
+        parsed.append(bytes(body))
+        return [retrieval.Article(title='Post', url='https://example.com/post', extra={'upvotes': 3})]
+    
+    first_run = retrieval.AIDataRetriever(cache_path=str(path))
+    first_run._session = FakeSession(FakeResponse(body=b'<rss/>', headers={'ETag': '"v1"'}))
+    items = await first_run._fetch_conditional(FEED_URL, parse)
+    first_run._save_conditional_cache()
+    
+    # The next run loads the validators from disk and gets a 304
+    second_run = retrieval.AIDataRetriever(cache_path=str(path))
+    second_run._session = FakeSession(FakeResponse(status=304))
+    assert await second_run._fetch_conditional(FEED_URL, parse) == items
+    assert second_run._session.requests[0][1]['If-None-Match'] == '"v1"'
+    assert parsed == [b'<rss/>']
+    
+    # Nothing changed on that run, so saving doesn't write the file back
+    path.unlink()
+    second_run._save_conditional_cache()
+    assert not path.exists()
+
+
+class SlowContent(FakeContent):
+    async def iter_chunked(self, size):
+        # Holds the request slot across a suspension, so the next request waits on it
+        await asyncio.sleep(0.01)
+        for chunk in self.chunks:
+            yield chunk
+
+
+def test_request_cap_works_in_a_loop_started_after_construction(monkeypatch):
+    monkeypatch.setattr(retrieval, 'MAX_CONCURRENT_REQUESTS', 1)
+    # Built outside any running loop, the way main() builds it before asyncio.run
+    retriever = retrieval.AIDataRetriever(cache_path=None)
+    responses = []
+    for _ in range(2):
+        response = FakeResponse(body=b'<rss/>')
+        response.content = SlowContent([b'<rss/>'])
+        responses.append(response)
+    retriever._session = FakeSession(*responses)
+    
+    async def fetch_both():
+        return await asyncio.gather(
+            retriever._get_with_retry('https://a.example.com/rss', {}),
+            retriever._get_with_retry('https://b.example.com/rss', {}),
+        )
+    
+    results = asyncio.run(fetch_both())
+    
+    assert [bytes(body) for body, _, _ in results] == [b'<rss/>', b'<rss/>']
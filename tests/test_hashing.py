@@ -0,0 +1,18 @@
+"""Offline tests for hashing"""
+
+import hashlib
+
+import hashing
+
+
+def test_fallback_digest_matches_blake3_length(monkeypatch):
+    default = hashing.content_hash('model', 'prompt')
+    monkeypatch.setattr(hashing, '_hasher', lambda: hashlib.blake2b(digest_size=hashing.DIGEST_SIZE))
+    fallback = hashing.content_hash('model', 'prompt')
+    
+    assert len(default) == len(fallback) == 2 * hashing.DIGEST_SIZE
+
+
+def test_part_boundaries_change_the_digest():
+    assert hashing.content_hash('ab', 'c') != hashing.content_hash('a', 'bc')
+    assert hashing.content_hash('abc') == hashing.content_hash(b'abc')
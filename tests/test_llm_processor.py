@@ -0,0 +1,249 @@
+"""Offline tests for llm_processor_enhanced"""
+
+from types import SimpleNamespace
+from typing import get_origin
+
+import httpx
+import orjson
+import pytest
+from google import genai
+from google.genai import _transformers
+from google.genai import errors as genai_errors
+
+import llm_processor_enhanced as llm
+
+SAMPLE_DATA = {
+    'news_articles': [
+        {'title': 'Lab announces model', 'summary': 'Details', 'source': 'Blog', 'category': 'Model Release'},
+    ]
+}
+
+
+class SchemaCheckingModels:
+    """
+    Stands in for client.aio.models
+    
+    Each response_schema is converted the way the SDK converts it before
+    sending, so an unsupported schema type fails here without network access.
+    """
+    
+    def __init__(self):
+        self.sdk_client = genai.Client(api_key='test')
+        self.schemas = []
+    
+    async def generate_content(self, model, contents, config=None):
+        schema = config['response_schema']
+        _transformers.t_schema(self.sdk_client, schema)
+        self.schemas.append(schema)
+        return SimpleNamespace(text='[]' if get_origin(schema) is list else '{}', usage_metadata=None)
+
+
+@pytest.fixture
+def processor():
+    processor = llm.GeminiProcessor(api_key='test', cache_path=None)
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=SchemaCheckingModels()))
+    return processor
+
+
+async def test_every_json_task_sends_a_schema_the_sdk_accepts(processor):
+    await processor.analyze_all_in_one("DATA")
+    await processor.extract_key_developments(SAMPLE_DATA, "DATA")
+    await processor.analyze_trends_and_patterns(SAMPLE_DATA, "DATA")
+    await processor.identify_breakthrough_technologies(SAMPLE_DATA, "DATA")
+    await processor.assess_industry_impact(SAMPLE_DATA, "DATA")
+    await processor.generate_actionable_insights(SAMPLE_DATA, "DATA")
+    await processor.predict_future_directions(SAMPLE_DATA, "DATA")
+    
+    # The task methods swallow errors, so count the schemas that converted
+    assert len(processor.client.aio.models.schemas) == 7
+
+
+class FlakyModels:
+    """Fails with the given transport errors, then answers"""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    async def generate_content(self, model, contents, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(text='ok', usage_metadata=None)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm, 'GEMINI_RETRY_BASE_DELAY', 0.0)
+
+
+async def test_transport_errors_are_retried(processor, no_backoff):
+    models = FlakyModels(httpx.ReadTimeout('read timed out'), httpx.ConnectError('connection refused'))
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    
+    response = await processor._call("prompt")
+    
+    assert response.text == 'ok'
+    assert models.calls == 3
+
+
+@pytest.fixture
+def recorded_sleeps(monkeypatch):
+    delays = []
+    
+    async def sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr(llm.asyncio, 'sleep', sleep)
+    return delays
+
+
+def api_error(code):
+    return genai_errors.APIError(code, {'error': {'code': code, 'message': 'test', 'status': 'TEST'}})
+
+
+async def test_rate_limits_are_retried_with_jittered_backoff(processor, recorded_sleeps):
+    models = FlakyModels(api_error(429), api_error(503))
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    
+    assert (await processor._call("prompt")).text == 'ok'
+    
+    assert len(recorded_sleeps) == 2
+    for attempt, delay in enumerate(recorded_sleeps):
+        nominal = llm.GEMINI_RETRY_BASE_DELAY * 2 ** attempt
+        assert 0.5 * nominal <= delay <= 1.5 * nominal
+
+
+async def test_request_errors_are_not_retried(processor, recorded_sleeps):
+    models = FlakyModels(api_error(400))
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    
+    with pytest.raises(genai_errors.APIError):
+        await processor._call("prompt")
+    
+    assert models.calls == 1
+    assert not recorded_sleeps
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Sure:\n```json\n{"a": [1, {"b": "}"}]}\n```', '{"a": [1, {"b": "}"}]}'),
+    ('[1, 2] and then prose', '[1, 2]'),
+    ('{"quote": "a \\" ] inside"} trailing', '{"quote": "a \\" ] inside"}'),
+    ('no JSON here', None),
+    ('{"unterminated": [1, 2}', None),
+])
+def test_first_json_value(text, expected):
+    assert llm._first_json_value(text) == expected
+
+
+def test_parse_json_falls_back_to_embedded_value():
+    assert llm._parse_json('Here is the analysis: {"trends": ["agents"]}') == {'trends': ['agents']}
+    with pytest.raises(orjson.JSONDecodeError):
+        llm._parse_json('no JSON here')
+
+
+def test_response_cache_persists_and_expires(tmp_path, monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr(llm.time, 'time', lambda: clock[0])
+    path = str(tmp_path / 'responses.sqlite3')
+    
+    cache = llm._ResponseCache(path, ttl=60)
+    cache.set('key', {'sections': ['a', 'b']})
+    cache.close()
+    
+    reopened = llm._ResponseCache(path, ttl=60)
+    assert reopened.get('key') == {'sections': ['a', 'b']}
+    assert reopened.get('missing') is None
+    
+    clock[0] += 61
+    assert reopened.get('key') is None
+    reopened.close()
+
+
+class CountingModels:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+    
+    async def generate_content(self, model, contents, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(text=self.text, usage_metadata=None)
+
+
+async def test_json_answers_are_served_from_the_response_cache(tmp_path):
+    processor = llm.GeminiProcessor(api_key='test', cache_path=str(tmp_path / 'responses.sqlite3'))
+    models = CountingModels('{"next_week": ["x"]}')
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    
+    first = await processor._generate_json("prompt", llm.FuturePredictions)
+    second = await processor._generate_json("prompt", llm.FuturePredictions)
+    other = await processor._generate_json("another prompt", llm.FuturePredictions)
+    await processor.aclose()
+    
+    assert first == second == other == {'next_week': ['x']}
+    assert models.calls == 2
+
+
+@pytest.mark.parametrize('text', ['{}', '[]'])
+async def test_empty_json_answers_are_not_cached(tmp_path, text):
+    processor = llm.GeminiProcessor(api_key='test', cache_path=str(tmp_path / 'responses.sqlite3'))
+    models = CountingModels(text)
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    
+    await processor._generate_json("prompt", llm.FuturePredictions)
+    await processor._generate_json("prompt", llm.FuturePredictions)
+    await processor.aclose()
+    
+    assert models.calls == 2
+
+
+async def test_empty_text_answers_are_not_cached(tmp_path):
+    processor = llm.GeminiProcessor(api_key='test', cache_path=str(tmp_path / 'responses.sqlite3'))
+    models = CountingModels('')
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    
+    assert await processor._generate_text("prompt") == ''
+    assert await processor._generate_text("prompt") == ''
+    await processor.aclose()
+    
+    assert models.calls == 2
+
+
+class StreamingModels:
+    async def generate_content_stream(self, model, contents, **kwargs):
+        async def chunks():
+            for text in ("First", " second", " third"):
+                yield SimpleNamespace(text=text)
+        return chunks()
+
+
+async def test_closing_a_summary_stream_releases_its_slot(processor):
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=StreamingModels()))
+    
+    stream = processor.stream_executive_summary(SAMPLE_DATA)
+    assert await stream.__anext__() == "First"
+    assert processor._semaphore._value == llm.GEMINI_MAX_CONCURRENCY - 1
+    
+    await stream.aclose()
+    assert processor._semaphore._value == llm.GEMINI_MAX_CONCURRENCY
+
+
+class SlowModels:
+    async def generate_content(self, model, contents, **kwargs):
+        # Holds the slot across a suspension, so the other call waits on it
+        await llm.asyncio.sleep(0.01)
+        return SimpleNamespace(text='ok', usage_metadata=None)
+
+
+def test_concurrency_cap_works_in_a_loop_started_after_construction(monkeypatch):
+    monkeypatch.setattr(llm, 'GEMINI_MAX_CONCURRENCY', 1)
+    # Built outside any running loop, the way main() builds it before asyncio.run
+    processor = llm.GeminiProcessor(api_key='test', cache_path=None)
+    processor.client = SimpleNamespace(aio=SimpleNamespace(models=SlowModels()))
+    
+    async def call_both():
+        return await llm.asyncio.gather(processor._call("a"), processor._call("b"))
+    
+    responses = llm.asyncio.run(call_both())
+    
+    assert [response.text for response in responses] == ['ok', 'ok']
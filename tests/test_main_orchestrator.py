@@ -0,0 +1,201 @@
+"""Offline tests for main_orchestrator"""
+
+import asyncio
+import logging
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from data_retrieval_enhanced import Article
+
+
+@pytest.fixture
+def orchestrator(main_orchestrator):
+    # Only the dedup state; the retrieval, LLM and email components aren't needed
+    cls = main_orchestrator.DailyAIUpdatesOrchestrator
+    orchestrator = cls.__new__(cls)
+    orchestrator._embedder = None
+    orchestrator._embedder_unavailable = False
+    return orchestrator
+
+
+@pytest.fixture
+def failing_model_loader(monkeypatch):
+    """A sentence_transformers module whose model load fails like an offline download"""
+    attempts = []
+    
+    def load(name):
+        attempts.append(name)
+        raise OSError(f"couldn't connect to huggingface.co to fetch {name}")
+    
+    module = ModuleType('sentence_transformers')
+    module.SentenceTransformer = load
+    monkeypatch.setitem(sys.modules, 'sentence_transformers', module)
+    return attempts
+
+
+def test_model_load_failure_keeps_every_item(orchestrator, failing_model_loader):
+    all_data = {
+        'news_articles': [Article(title='A'), Article(title='A again')],
+        'company_updates': [Article(title='B')],
+    }
+    
+    assert orchestrator._dedupe(all_data) is all_data
+    # The failure is remembered, so later runs don't retry the download
+    assert orchestrator._dedupe(all_data) is all_data
+    assert len(failing_model_loader) == 1
+
+
+def test_exact_repeats_collapse_without_the_embedding_model(orchestrator, failing_model_loader):
+    all_data = {
+        'news_articles': [
+            Article(title='Model launch', url='https://example.com/launch/'),
+            Article(title='Unrelated', url='https://example.com/other'),
+        ],
+        'company_updates': [
+            {'title': 'Launch, as reposted', 'url': 'https://EXAMPLE.com/launch#top'},
+            {'title': '  model   LAUNCH '},
+        ],
+    }
+    
+    deduped = orchestrator._dedupe(all_data)
+    
+    kept, unrelated = deduped['news_articles']
+    assert kept.title == 'Model launch' and kept.get('duplicates_count') == 2
+    assert unrelated.get('duplicates_count') is None
+    assert deduped['company_updates'] == []
+
+
+class StreamingProcessor:
+    async def stream_executive_summary(self, all_data):
+        for chunk in ("First li", "ne\nSecond", " line"):
+            yield chunk
+
+
+async def test_llm_check_logs_streamed_summary_by_line(orchestrator, capsys, caplog):
+    orchestrator.llm_processor = StreamingProcessor()
+    
+    with caplog.at_level(logging.INFO, logger='main_orchestrator'):
+        assert await orchestrator._test_llm()
+    
+    assert "  First line" in caplog.messages
+    assert "  Second line" in caplog.messages
+    assert "line" not in capsys.readouterr().out
+
+
+class FixedEmbedder:
+    """Embeds each text as the unit vector at the angle given for its title"""
+    
+    def __init__(self, np, angles):
+        self.np = np
+        self.angles = angles
+    
+    def encode(self, texts, **kwargs):
+        radians = self.np.radians([self.angles[text.split('.')[0]] for text in texts])
+        return self.np.stack([self.np.cos(radians), self.np.sin(radians)], axis=1).astype(self.np.float32)
+
+
+@pytest.mark.parametrize('block_rows', [1, 512])
+def test_near_duplicates_collapse_into_the_earliest_item(orchestrator, main_orchestrator, monkeypatch, block_rows):
+    np = pytest.importorskip('numpy')
+    # One row per block exercises pairs that cross block boundaries
+    monkeypatch.setattr(main_orchestrator, 'SEMANTIC_DEDUP_BLOCK_ROWS', block_rows)
+    # cos(18°) ≈ 0.95 links neighbours; cos(36°) ≈ 0.81 alone wouldn't, so
+    # Launch 0° – 18° – 36° form one cluster only through union-find
+    orchestrator._embedder = FixedEmbedder(np, {
+        'Launch': 0, 'Launch recap': 18, 'Unrelated': 90, 'Launch recap 2': 36,
+    })
+    all_data = {
+        'news_articles': [Article(title='Launch'), Article(title='Unrelated')],
+        'company_updates': [{'title': 'Launch recap'}, {'title': 'Launch recap 2'}],
+        'metadata': 'kept as is',
+    }
+    
+    deduped = orchestrator._dedupe(all_data)
+    
+    kept, unrelated = deduped['news_articles']
+    assert kept.title == 'Launch' and kept.get('duplicates_count') == 2
+    assert unrelated.title == 'Unrelated' and unrelated.get('duplicates_count') is None
+    assert deduped['company_updates'] == []
+    assert deduped['metadata'] == 'kept as is'
+
+
+class HangingStep:
+    """An awaitable setup step that only ends when cancelled"""
+    
+    def __init__(self):
+        self.cancelled = False
+    
+    async def __call__(self):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def fail(*args, **kwargs):
+    await asyncio.sleep(0)  # lets the background steps start
+    raise RuntimeError("phase failed")
+
+
+async def succeed(*args, **kwargs):
+    return {}
+
+
+@pytest.mark.parametrize('failing_phase', ['retrieval', 'analysis'])
+async def test_failed_phase_cancels_background_setup(orchestrator, failing_phase):
+    warmup, connect = HangingStep(), HangingStep()
+    orchestrator.data_retriever = SimpleNamespace(
+        fetch_all_sources=fail if failing_phase == 'retrieval' else succeed,
+        get_summary_stats=lambda all_data: {'total_items': 0, 'sources_count': 0},
+    )
+    orchestrator.llm_processor = SimpleNamespace(
+        warmup=warmup if failing_phase == 'retrieval' else succeed,
+        process_all_data=fail,
+    )
+    orchestrator.email_reporter = SimpleNamespace(connect=connect)
+    
+    result = await orchestrator.run_daily_workflow()
+    
+    assert result['success'] is False
+    if failing_phase == 'retrieval':
+        assert warmup.cancelled
+    else:
+        assert connect.cancelled
+
+
+class FlakyReporter:
+    """Misses one recipient on the first send, reaches it on the retry"""
+    
+    def __init__(self):
+        self.report_times = []
+        self.last_delivery = None
+    
+    async def connect(self):
+        return True
+    
+    async def send_daily_report(self, analysis, all_data, stats, now=None):
+        self.report_times.append(now)
+        if len(self.report_times) == 1:
+            self.last_delivery = {'delivered': ['a@example.com'], 'skipped': [], 'failed': ['b@example.com']}
+            return False
+        self.last_delivery = {'delivered': ['b@example.com'], 'skipped': ['a@example.com'], 'failed': []}
+        return True
+
+
+async def test_partial_send_is_retried_with_the_same_report_time(orchestrator):
+    orchestrator.data_retriever = SimpleNamespace(
+        fetch_all_sources=succeed,
+        get_summary_stats=lambda all_data: {'total_items': 0, 'sources_count': 0},
+    )
+    orchestrator.llm_processor = SimpleNamespace(warmup=succeed, process_all_data=succeed)
+    orchestrator.email_reporter = FlakyReporter()
+    
+    result = await orchestrator.run_daily_workflow()
+    
+    times = orchestrator.email_reporter.report_times
+    assert result['email_sent'] is True
+    assert len(times) == 2 and times[0] is times[1]
+    assert result['email_delivery']['failed'] == []